@@ -1,12 +1,21 @@
 import cv2
 import os
 
-def detectBlink(file):
+from cam_events import make_event
+from cam_frame import reduce_frame
+from cam_profile import NULL_PROFILER
+from cam_source import FrameSource
+
+def detectBlink(file, analysis_width=None, roi=None, sink=None, profiler=None):
+    # analysis_width: 밝기 계산에 쓰는 가로 폭 (None 이면 원본), roi: 검사할 영역 (x, y, w, h)
+    # sink: cam_events 의 EventSink. 지정하면 print 대신 이벤트로 기록
+    # profiler: cam_profile.StageProfiler. 지정하면 단계별 처리 시간을 기록
+    profiler = profiler or NULL_PROFILER
 # 동영상 파일 경로
     video_path = file
 
     # 동영상 파일 열기
-    cap = cv2.VideoCapture(video_path)
+    cap = FrameSource(video_path, gray=True)
 
     if not cap.isOpened():
         print("오류: 동영상 파일을 열 수 없습니다.")
@@ -15,43 +24,52 @@ def detectBlink(file):
     # 깜빡임 감지를 위한 임계값 설정
     # 이 값은 영상의 특성에 따라 조절해야 합니다.
     blink_threshold = 50.0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
 
     # 첫 번째 프레임의 평균 밝기 초기화
     ret, prev_frame = cap.read()
     if not ret:
         print("오류: 첫 프레임을 읽을 수 없습니다.")
         exit()
-    prev_gray_frame = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
+    prev_gray_frame = reduce_frame(prev_frame, roi, analysis_width)
     prev_avg_luminosity = prev_gray_frame.mean()
 
     frame_count = 1
     number =0
     while True:
+        profiler.lap("loop")
         ret, current_frame = cap.read()
+        profiler.lap("decode")
         if not ret:
             break
         number+=1
         # 현재 프레임을 회색조로 변환
-        current_gray_frame = cv2.cvtColor(current_frame, cv2.COLOR_BGR2GRAY)
+        current_gray_frame = reduce_frame(current_frame, roi, analysis_width)
+        profiler.lap("gray")
 
         # 현재 프레임의 평균 밝기 계산
         current_avg_luminosity = current_gray_frame.mean()
+        profiler.lap("mean")
 
         # 이전 프레임과의 밝기 차이 계산
         luminosity_diff = abs(current_avg_luminosity - prev_avg_luminosity)
 
         # 밝기 차이가 임계값을 초과하면 깜빡임으로 간주
-        if(luminosity_diff>5):
-            print("dif:",number,":",luminosity_diff)
-        if luminosity_diff > blink_threshold:
-            print(f"[경고] 프레임 {frame_count}에서 깜빡임 감지! 밝기 변화: {luminosity_diff:.2f}")
+        if sink is not None:
+            if luminosity_diff > blink_threshold:
+                sink.emit(make_event(frame_count, "blink", "luminosity_diff", luminosity_diff, file=video_path,
+                                     timestamp=frame_count / fps if fps else None))
+        else:
+            if(luminosity_diff>5):
+                print("dif:",number,":",luminosity_diff)
+            if luminosity_diff > blink_threshold:
+                print(f"[경고] 프레임 {frame_count}에서 깜빡임 감지! 밝기 변화: {luminosity_diff:.2f}")
 
         # 다음 반복을 위해 현재 프레임을 이전 프레임으로 저장
         prev_avg_luminosity = current_avg_luminosity
         frame_count += 1
 
     cap.release()
-    cv2.destroyAllWindows()
     
     
 def checkFoloder():
@@ -69,7 +87,7 @@ if __name__ == "__main__":
     output_folder = "output"  # 이미지를 저장할 폴더명
     foler = checkFoloder()
     print("folder:",foler)
-    video_file = foler +"\\input_blink.mp4"
-#    output_folder =foler +"\output"
+    video_file = os.path.join(foler, "input_blink.mp4")
+#    output_folder =os.path.join(foler, "output")
     
     detectBlink(video_file)
\ No newline at end of file
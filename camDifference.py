@@ -1,25 +1,49 @@
 import cv2
 import os
 
-
-def camDifference(testfile):
+from cam_frame import to_gray
+from cam_preview import show_preview, close_preview
+from cam_profile import NULL_PROFILER
+from cam_source import open_source
+
+
+def camDifference(testfile, preview_every=1, wait_ms=30, profiler=None):
+    """
+    첫 프레임과 비교하여 변화가 생긴 영역을 찾습니다.
+
+    Args:
+        testfile (str): 입력 동영상 파일의 경로
+        preview_every (int): N 프레임마다 화면 표시. 0 이면 창 없이 디코딩 속도로 실행 (헤드리스)
+        wait_ms (int): 화면 표시 후 키 입력 대기 시간 (ms)
+        profiler (StageProfiler): 지정하면 단계별 처리 시간을 기록 (cam_profile)
+
+    Returns:
+        list: 변화가 감지된 프레임의 (프레임 번호, [(x, y, w, h), ...]) 목록
+    """
+    profiler = profiler or NULL_PROFILER
     # 동영상 파일 로드
     cap = cv2.VideoCapture(testfile)
 
     # 첫 번째 프레임을 읽어서 회색조로 변환
     ret, first_frame = cap.read()
-    first_gray = cv2.cvtColor(first_frame, cv2.COLOR_BGR2GRAY)
+    first_gray = to_gray(first_frame)
     first_gray = cv2.GaussianBlur(first_gray, (21, 21), 0)
 
+    changes = []
+    count = 0
     while True:
+        profiler.lap("loop")
         # 다음 프레임을 읽어옴
         ret, frame = cap.read()
+        profiler.lap("decode")
         if not ret:
             break
 
         # 현재 프레임을 회색조로 변환하고 블러 처리
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = to_gray(frame)
+        profiler.lap("cvtColor")
         gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        profiler.lap("GaussianBlur")
 
         # 첫 프레임과 현재 프레임의 차이를 계산
         frame_delta = cv2.absdiff(first_gray, gray)
@@ -27,23 +51,116 @@ def camDifference(testfile):
         # 차이 이미지를 이진화하여 임계값 적용
         thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
         thresh = cv2.dilate(thresh, None, iterations=2)
+        profiler.lap("diff")
 
         # 변화가 있는 영역(윤곽선) 찾기
         contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        profiler.lap("findContours")
 
-        # 변화가 감지된 영역에 사각형 그리기
+        # 변화가 감지된 영역 수집
+        boxes = []
         for contour in contours:
             if cv2.contourArea(contour) > 500:  # 일정 크기 이상의 변화만 감지
-                (x, y, w, h) = cv2.boundingRect(contour)
+                boxes.append(cv2.boundingRect(contour))
+        if boxes:
+            changes.append((count, boxes))
+
+        # 화면에 표시하는 프레임에만 사각형 그리기
+        if preview_every and count % preview_every == 0:
+            for (x, y, w, h) in boxes:
                 cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        stop = show_preview('Frame Difference', frame, count, preview_every, wait_ms)
+        profiler.lap("preview")
+        if stop:
+            break
+        count += 1
 
-        cv2.imshow('Frame Difference', frame)
+    cap.release()
+    close_preview(preview_every)
+    return changes
+
+
+def _small_gray(frame, levels):
+    # 흑백 변환 후 가우시안 피라미드로 줄이고 약하게 블러 (원본의 21x21 블러에 해당)
+    gray = to_gray(frame)
+    for _ in range(levels):
+        gray = cv2.pyrDown(gray)
+    return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+def detect_motion(testfile, method="average", alpha=0.05, levels=2, diff_threshold=25, min_area=500,
+                  preview_every=0, wait_ms=1):
+    """
+    점진적으로 갱신되는 배경 모델과 비교하여 움직임이 있는 영역을 찾습니다.
+
+    첫 프레임과만 비교하는 camDifference 와 달리 배경이 천천히 바뀌어도 따라가며,
+    피라미드로 줄인 영상에서 계산하고 변화된 픽셀 수가 min_area 보다 적은 프레임은
+    윤곽선 추출을 건너뛰므로 정지 화면에서 훨씬 빠릅니다.
+
+    Args:
+        testfile (str): 입력 동영상 파일의 경로 또는 FrameStore 같은 프레임 소스
+        method (str): "average" (cv2.accumulateWeighted 이동 평균) 또는 "mog2" (MOG2 배경 차분)
+        alpha (float): 이동 평균 배경의 갱신 비율 (0-1)
+        levels (int): pyrDown 횟수. 한 번마다 가로/세로가 절반이 됩니다.
+        diff_threshold (int): 배경과의 밝기 차이 임계값 (average 방식)
+        min_area (int): 원본 해상도 기준 최소 변화 면적 (픽셀)
+        preview_every (int): N 프레임마다 화면 표시. 0 이면 헤드리스
+        wait_ms (int): 화면 표시 후 키 입력 대기 시간 (ms)
+
+    Returns:
+        list: 움직임이 감지된 프레임의 (프레임 번호, [(x, y, w, h), ...]) 목록. 좌표는 원본 해상도 기준
+    """
+    cap = open_source(testfile)
+    scale = 2 ** levels
+    small_area = min_area / (scale * scale)
+    subtractor = None
+    if method == "mog2":
+        subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+    elif method != "average":
+        raise ValueError(f"Unsupported method: {method}")
+
+    background = None
+    changes = []
+    count = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
 
-        if cv2.waitKey(30) & 0xFF == ord('q'):
+        small = _small_gray(frame, levels)
+        if subtractor is not None:
+            mask = subtractor.apply(small)
+        else:
+            if background is None:
+                background = small.astype("float32")
+            # 배경과의 차이를 구한 뒤 현재 프레임을 배경에 조금씩 반영
+            delta = cv2.absdiff(small, cv2.convertScaleAbs(background))
+            cv2.accumulateWeighted(small, background, alpha)
+            mask = cv2.threshold(delta, diff_threshold, 255, cv2.THRESH_BINARY)[1]
+
+        boxes = []
+        # 변화된 픽셀이 최소 면적보다 적으면 윤곽선 추출 생략
+        if cv2.countNonZero(mask) >= small_area:
+            mask = cv2.dilate(mask, None, iterations=2)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            for contour in contours:
+                if cv2.contourArea(contour) > small_area:
+                    (x, y, w, h) = cv2.boundingRect(contour)
+                    boxes.append((x * scale, y * scale, w * scale, h * scale))
+        if boxes:
+            changes.append((count, boxes))
+
+        if preview_every and count % preview_every == 0:
+            frame = frame.copy()
+            for (x, y, w, h) in boxes:
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        if show_preview('Motion', frame, count, preview_every, wait_ms):
             break
+        count += 1
 
     cap.release()
-    cv2.destroyAllWindows()
+    close_preview(preview_every)
+    return changes
     
 def checkFoloder():
     # 현재 실행 파일의 경로
@@ -61,6 +178,6 @@ if __name__ == "__main__":
     video_file = "input.mp4"  # 처리할 동영상 파일명
     output_folder = "output"  # 이미지를 저장할 폴더명
     foler = checkFoloder()
-    video_file = foler +"\input.mp4"
-    output_folder =foler +"\output"
+    video_file = os.path.join(foler, "input.mp4")
+    output_folder =os.path.join(foler, "output")
     camDifference(video_file)
\ No newline at end of file
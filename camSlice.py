@@ -1,39 +1,120 @@
 import cv2
+import numpy as np
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def extract_frames(video_path, output_dir):
+from cam_source import seek_frame
+
+# 저장 형식별 확장자와 cv2.imencode 옵션
+IMAGE_FORMATS = {
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+}
+
+
+def _save_frame(path, image, fmt, quality):
+    # 작업 스레드에서 실행: cv2.imencode 는 GIL 을 놓으므로 디코딩과 병렬로 인코딩됨
+    if fmt == "npy":
+        np.save(path, image)
+        return
+    ext, flag = IMAGE_FORMATS[fmt]
+    params = [flag, quality] if quality is not None else []
+    ok, buffer = cv2.imencode(ext, image, params)
+    if not ok:
+        raise IOError(f"Could not encode frame {path}")
+    with open(path, "wb") as f:
+        f.write(buffer.tobytes())
+
+
+def extract_frames(video_path, output_dir, every_n=1, start_sec=None, end_sec=None, frames=None,
+                   fmt="jpg", quality=None, workers=4):
     """
     동영상 파일에서 프레임을 추출하여 이미지로 저장합니다.
 
+    디코딩은 현재 스레드에서 하고, 인코딩과 파일 쓰기는 작업 스레드 풀에서 처리합니다.
+    선택되지 않은 프레임은 grab()으로 건너뛰어 디코딩 비용을 줄입니다.
+
     Args:
-        video_path (str): 입력 동영상 파일의 경로
+        video_path (str): 입력 동영상 파일의 경로 또는 FrameStore 같은 프레임 소스
         output_dir (str): 추출된 이미지를 저장할 디렉터리
+        every_n (int): N 프레임마다 하나씩 저장
+        start_sec (float): 추출 시작 시각 (초). None 이면 처음부터
+        end_sec (float): 추출 끝 시각 (초). None 이면 끝까지
+        frames (iterable): 저장할 프레임 번호 목록 (예: 검출기 보고서의 이벤트 프레임). None 이면 전체
+        fmt (str): "jpg", "png", "webp" 또는 "npy" (원본 배열)
+        quality (int): JPEG/WebP 품질 (0-100) 또는 PNG 압축 수준 (0-9). None 이면 OpenCV 기본값
+        workers (int): 인코딩 작업 스레드 수
+
+    Returns:
+        int: 저장한 프레임 수
     """
+    if fmt != "npy" and fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
     # 동영상 파일 열기
-    vidcap = cv2.VideoCapture(video_path)
+    vidcap = video_path if hasattr(video_path, "read") else cv2.VideoCapture(video_path)
     if not vidcap.isOpened():
         print(f"Error: Could not open video file {video_path}")
-        return
+        return 0
 
     # 출력 디렉터리가 없으면 생성
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"Created directory: {output_dir}")
 
-    success, image = vidcap.read()
+    fps = vidcap.get(cv2.CAP_PROP_FPS) or 30.0
+    first = int(start_sec * fps) if start_sec is not None else 0
+    last = int(end_sec * fps) if end_sec is not None else None
+    selected = None
+    if frames is not None:
+        selected = set(int(index) for index in frames)
+        if not selected:
+            vidcap.release()
+            return 0
+        first = max(first, min(selected))
+        last = max(selected) if last is None else min(last, max(selected))
+
+    if first > 0 and not seek_frame(vidcap, first):
+        vidcap.release()
+        return 0
+
+    # 인코딩이 밀릴 때 디코딩된 프레임이 메모리에 쌓이지 않도록 동시에 처리 중인 프레임 수를 제한
+    in_flight = threading.BoundedSemaphore(workers * 2)
+    ext = ".npy" if fmt == "npy" else IMAGE_FORMATS[fmt][0]
+    futures = []
     count = 0
+    index = first
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while last is None or index <= last:
+            wanted = (index - first) % every_n == 0 and (selected is None or index in selected)
+            if not wanted:
+                # 저장하지 않는 프레임은 디코딩 없이 건너뜀
+                if not vidcap.grab():
+                    break
+                index += 1
+                continue
+
+            success, image = vidcap.read()
+            if not success:
+                break
+
+            frame_filename = os.path.join(output_dir, f"frame_{index}{ext}")
+            in_flight.acquire()
+            future = pool.submit(_save_frame, frame_filename, image, fmt, quality)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+            count += 1
+            index += 1
 
-    while success:
-        # 프레임 이미지를 JPEG 파일로 저장
-        frame_filename = os.path.join(output_dir, f"frame_{count}.jpg")
-        cv2.imwrite(frame_filename, image)
-        
-        # 다음 프레임 읽기
-        success, image = vidcap.read()
-        count += 1
+        # 인코딩 중 오류가 있었으면 여기서 다시 발생시킴
+        for future in futures:
+            future.result()
 
     vidcap.release()
     print(f"Successfully extracted {count} frames to {output_dir}")
+    return count
 
 def checkFoloder():
     # 현재 실행 파일의 경로
@@ -49,6 +130,6 @@ if __name__ == "__main__":
     video_file = "input_blink.mp4"  # 처리할 동영상 파일명
     output_folder = "output"  # 이미지를 저장할 폴더명
     foler = checkFoloder()
-    video_file = foler +"\input_blink.mp4"
-    output_folder =foler +"\output"
+    video_file = os.path.join(foler, "input_blink.mp4")
+    output_folder =os.path.join(foler, "output")
     extract_frames(video_file, output_folder)
\ No newline at end of file
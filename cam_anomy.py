@@ -1,43 +1,79 @@
 import cv2
 import os
 
-def detect_screen_anomaly(frame):
-    # 프레임의 평균 밝기 계산
-    avg_brightness = cv2.mean(frame)[0]
-    if avg_brightness < 10:  # 임계값 10 이하 (어두운 화면)
-        return "화면 출력 안됨 (Black Screen)"
+from cam_events import make_event
+from cam_frame import reduce_frame
+from cam_preview import show_preview, close_preview
+from cam_profile import NULL_PROFILER
+from cam_source import open_source
 
-    # 프레임의 표준 편차 계산 (노이즈 감지)
+def screen_anomaly_metric(frame):
+    # 이상이 있으면 판단에 쓴 (측정값 이름, 값), 정상이면 None
+    # 프레임의 평균 밝기와 표준 편차를 한 번에 계산
     mean, std_dev = cv2.meanStdDev(frame)
+    if mean[0][0] < 10:  # 임계값 10 이하 (어두운 화면)
+        return "mean", mean[0][0]
+
+    # 표준 편차로 노이즈 감지
     if std_dev[0][0] > 100 : #50 : # 표준 편차 임계값
-        result = " 화면 노이즈 ( Noise)" + str(std_dev[0][0])
-        return result
-        
-    return "정상"
+        return "stddev", std_dev[0][0]
+
+    return None
+
+def detect_screen_anomaly(frame):
+    anomaly = screen_anomaly_metric(frame)
+    if anomaly is None:
+        return "정상"
+
+    metric, value = anomaly
+    if metric == "mean":
+        return "화면 출력 안됨 (Black Screen)"
+    result = " 화면 노이즈 ( Noise)" + str(value)
+    return result
 
-def assessment(video_path):
+def assessment(video_path, preview_every=1, analysis_width=None, roi=None, sink=None, profiler=None):
+    # preview_every: N 프레임마다 화면 표시, 0 이면 창 없이 디코딩 속도로 실행 (헤드리스)
+    # analysis_width: 통계 계산에 쓰는 가로 폭 (None 이면 원본), roi: 검사할 영역 (x, y, w, h)
+    # sink: cam_events 의 EventSink. 지정하면 print 대신 이벤트로 기록
+    # profiler: cam_profile.StageProfiler. 지정하면 단계별 처리 시간을 기록
+    profiler = profiler or NULL_PROFILER
     # 예시: 웹캠(0)으로부터 영상 스트리밍
 #    cap = cv2.VideoCapture(0)
-    cap = cv2.VideoCapture(video_path) # 동영상 파일 열기
+    # video_path 는 동영상 경로 또는 FrameStore 같은 프레임 소스
+    cap = open_source(video_path) # 동영상 파일 열기 (백그라운드 디코딩)
     count =0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
 
     while True:
+        profiler.lap("loop")
         ret, frame = cap.read()
+        profiler.lap("decode")
         if not ret:
             break
 
-        status = detect_screen_anomaly(frame)
-        if status != "정상":
-            print(f"이상 감지: {count},{status}")
-            # 여기에 알림 로직 추가 (e.g., notice.show())
+        analysis_frame = reduce_frame(frame, roi, analysis_width, gray=False)
+        profiler.lap("reduce")
+        if sink is not None:
+            anomaly = screen_anomaly_metric(analysis_frame)
+            if anomaly is not None:
+                sink.emit(make_event(count, "noise", anomaly[0], anomaly[1],
+                                     file=str(getattr(video_path, "path", video_path)),
+                                     timestamp=count / fps if fps else None))
+        else:
+            status = detect_screen_anomaly(analysis_frame)
+            if status != "정상":
+                print(f"이상 감지: {count},{status}")
+                # 여기에 알림 로직 추가 (e.g., notice.show())
+        profiler.lap("meanStdDev")
 
-        cv2.imshow('Screen Analysis', frame)
+        stop = show_preview('Screen Analysis', frame, count, preview_every)
+        profiler.lap("preview")
         count +=1
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        if stop:
             break
 
     cap.release()
-    cv2.destroyAllWindows()
+    close_preview(preview_every)
 
 
 def checkFoloder():
@@ -56,7 +92,7 @@ if __name__ == "__main__":
     video_file = "input.mp4"  # 처리할 동영상 파일명
     output_folder = "output"  # 이미지를 저장할 폴더명
     folder = checkFoloder()
-    video_file = folder +"\\input.mp4"
-#    output_folder =folder +"\output"
+    video_file = os.path.join(folder, "input.mp4")
+#    output_folder =os.path.join(folder, "output")
     print("target file:",video_file)
     assessment(video_file)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cam_capture import configure
+from cam_engine import analyze_video
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")
+STATUS_FILE = "batch_status.json"
+
+
+def collect_videos(target):
+    """
+    디렉터리 또는 glob 패턴에서 분석할 동영상 파일 목록을 만듭니다.
+
+    Args:
+        target (str): 디렉터리 경로 (하위 디렉터리 포함) 또는 glob 패턴 (예: captures/**/*.mp4)
+
+    Returns:
+        list: 동영상 파일 경로 목록
+    """
+    if os.path.isdir(target):
+        files = []
+        for root, _, names in os.walk(target):
+            for name in names:
+                if name.lower().endswith(VIDEO_EXTENSIONS):
+                    files.append(os.path.join(root, name))
+        return files
+    return [path for path in glob.glob(target, recursive=True) if os.path.isfile(path)]
+
+
+def result_path(output_dir, video_path):
+    # 다른 폴더의 같은 이름 파일이 겹치지 않도록 전체 경로의 해시를 붙임
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    digest = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(output_dir, f"{stem}_{digest}.json")
+
+
+def _write_json(path, data):
+    # 중간에 중단되어도 반쯤 쓰인 결과 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def analyze_file(video_path, output_file, analyze=analyze_video):
+    """
+    파일 하나를 분석하고 결과를 JSON 으로 저장합니다. (작업 프로세스에서 실행)
+
+    Returns:
+        str: "done" 또는 "failed"
+    """
+    report = analyze(video_path)
+    if report is None:
+        return "failed"
+    _write_json(output_file, report)
+    return "done"
+
+
+def run_batch(target, output_dir, workers=None, analyze=analyze_video, backend=None, threads=None):
+    """
+    여러 동영상을 프로세스 풀에서 분석합니다.
+
+    큰 파일이 마지막에 남아 전체 시간이 늘어나지 않도록 크기가 큰 파일부터 배정하고,
+    이미 결과 파일이 있는 동영상은 건너뛰므로 중단된 작업을 다시 실행하면 이어서 처리합니다.
+    파일별 상태는 output_dir 의 batch_status.json 에 기록합니다.
+
+    Args:
+        target (str): 디렉터리 또는 glob 패턴
+        output_dir (str): 결과 JSON 을 저장할 디렉터리
+        workers (int): 프로세스 수. None 이면 CPU 코어 수.
+        analyze (callable): 파일 하나를 분석하는 함수. 프로세스로 넘길 수 있는 최상위 함수여야 합니다.
+        backend (str): 작업 프로세스의 디코딩 백엔드 ("auto", "ffmpeg", "pyav"). None 이면 "auto"
+        threads (int): 작업 프로세스의 디코더 스레드 수. None 이면 백엔드 기본값
+
+    Returns:
+        dict: 파일 경로별 상태 ("skipped", "done", "failed")
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    files = sorted(collect_videos(target), key=os.path.getsize, reverse=True)
+    status = {}
+    pending = []
+    for video_path in files:
+        if os.path.exists(result_path(output_dir, video_path)):
+            status[video_path] = "skipped"
+        else:
+            status[video_path] = "pending"
+            pending.append(video_path)
+
+    status_file = os.path.join(output_dir, STATUS_FILE)
+    _write_json(status_file, status)
+    if not pending:
+        return status
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure, initargs=(backend, threads)) as pool:
+        futures = {}
+        for video_path in pending:
+            future = pool.submit(analyze_file, video_path, result_path(output_dir, video_path), analyze)
+            futures[future] = video_path
+            status[video_path] = "queued"
+
+        for future in as_completed(futures):
+            video_path = futures[future]
+            try:
+                status[video_path] = future.result()
+            except Exception as e:
+                print(f"Error: {video_path}: {e}")
+                status[video_path] = "failed"
+            _write_json(status_file, status)
+
+    return status
+
+
+# 사용 예제
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동영상 폴더 일괄 분석")
+    parser.add_argument("target", help="동영상 디렉터리 또는 glob 패턴")
+    parser.add_argument("output", help="결과 JSON 저장 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--backend", choices=["auto", "ffmpeg", "pyav"], default=None, help="디코딩 백엔드")
+    parser.add_argument("--threads", type=int, default=None, help="프로세스별 디코더 스레드 수")
+    args = parser.parse_args()
+
+    result = run_batch(args.target, args.output, args.workers, backend=args.backend, threads=args.threads)
+    for state in ("done", "skipped", "failed"):
+        print(f"{state}: {sum(1 for s in result.values() if s == state)}")
@@ -0,0 +1,260 @@
+import argparse
+import cv2
+import json
+import numpy as np
+import os
+import time
+import tracemalloc
+
+from blink import detectBlink
+from cam_anomy import assessment
+from cam_detectBlack import detect_black_screen, find_black_intervals
+from cam_engine import (BlackScreenDetector, BlinkDetector, GlitchDetector, NoiseDetector,
+                        TileGlitchDetector, analyze_video, default_detectors)
+from cam_events import ListEventSink
+from cam_findBroken import checkSignal
+from cam_profile import StageProfiler
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# 기본으로 넣는 결함: (종류, 시작 프레임, 길이)
+DEFAULT_FAULTS = [
+    ("black", 40, 20),
+    ("flash", 100, 3),
+    ("noise", 150, 5),
+    ("macroblock", 220, 4),
+]
+
+# 결함 종류별로 각 검출기가 보고해야 하는 프레임
+#   black: 밝기가 떨어지고 돌아오는 프레임에서 깜빡임/깨짐, 구간 전체가 어두운 화면,
+#          블랙 구간(black_interval)은 구간 시작 프레임
+#   flash: 밝기가 튀고 돌아오는 프레임에서 깜빡임/깨짐
+#   noise: 구간 전체가 노이즈, 프레임마다 전체 픽셀이 바뀜
+#   macroblock: 구간 전체에서 일부 블록만 바뀜 (블록 깨짐은 이 결함에서만 보고되어야 함.
+#               black, flash, noise 는 화면 전체가 바뀌므로 tile_glitch 가 장면 전환으로 무시함)
+
+
+def _base_frame(width, height):
+    # 가로 방향 그라데이션 배경 (평균 밝기 약 120)
+    row = np.linspace(60, 180, width, dtype=np.float32)
+    gray = np.tile(row, (height, 1)).astype(np.uint8)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+def generate_video(path, resolution="720p", frames=300, fps=30, faults=DEFAULT_FAULTS, seed=0,
+                   duration_frames=10):
+    """
+    결함이 들어간 위치를 알고 있는 합성 테스트 동영상을 만듭니다.
+
+    Args:
+        path (str): 저장할 동영상 경로 (.avi, MJPG)
+        resolution (str): "720p", "1080p", "4k"
+        frames (int): 전체 프레임 수
+        fps (int): 초당 프레임 수
+        faults (list): (종류, 시작 프레임, 길이) 목록. 종류는 black, flash, noise, macroblock
+        seed (int): 난수 시드
+        duration_frames (int): 블랙 화면 검출기의 최소 지속 프레임 수 (정답 계산용)
+
+    Returns:
+        dict: 검출기 이름별로 보고되어야 하는 프레임 번호 목록 (정답)
+    """
+    width, height = RESOLUTIONS[resolution]
+    rng = np.random.default_rng(seed)
+    base = _base_frame(width, height)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+
+    kinds = {}
+    for kind, start, length in faults:
+        for index in range(start, min(start + length, frames)):
+            kinds[index] = kind
+
+    for index in range(frames):
+        kind = kinds.get(index)
+        if kind == "black":
+            frame = np.zeros_like(base)
+        elif kind == "flash":
+            frame = np.full_like(base, 255)
+        elif kind == "noise":
+            # 0/255 점 노이즈 (표준 편차 약 127)
+            frame = cv2.cvtColor((rng.integers(0, 2, (height, width), dtype=np.uint8) * 255),
+                                 cv2.COLOR_GRAY2BGR)
+        elif kind == "macroblock":
+            frame = base.copy()
+            for _ in range(3):
+                x = int(rng.integers(0, width // 64)) * 64
+                y = int(rng.integers(0, height // 64)) * 64
+                frame[y:y + 64, x:x + 64] = rng.integers(0, 256, 3)
+        else:
+            frame = base
+        writer.write(frame)
+    writer.release()
+
+    truth = {"blink": set(), "black_screen": set(), "black_interval": set(), "noise": set(), "glitch": set(),
+             "tile_glitch": set()}
+    for kind, start, length in faults:
+        end = min(start + length, frames)
+        if kind in ("black", "flash"):
+            truth["blink"].update((start, end))
+            truth["glitch"].update((start, end))
+        if kind == "black":
+            truth["noise"].update(range(start, end))
+            if end - start >= duration_frames:
+                truth["black_screen"].add(start + duration_frames - 1)
+                truth["black_interval"].add(start)
+        if kind == "noise":
+            truth["noise"].update(range(start, end))
+            truth["glitch"].update(range(start, end + 1))
+        if kind == "macroblock":
+            # 블록이 바뀐 프레임과, 원래 화면으로 돌아오는 end 프레임 (이전 블록 위치가 다시 바뀜)
+            truth["glitch"].update(range(start, end + 1))
+            truth["tile_glitch"].update(range(start, end + 1))
+    return {name: sorted(i for i in indices if i < frames) for name, indices in truth.items()}
+
+
+def precision_recall(detected, expected, tolerance=1):
+    """
+    프레임 번호 기준 정밀도/재현율. tolerance 프레임 이내면 맞은 것으로 봅니다.
+    """
+    detected = sorted(set(detected))
+    expected = sorted(set(expected))
+    hit = sum(1 for d in detected if any(abs(d - e) <= tolerance for e in expected))
+    found = sum(1 for e in expected if any(abs(d - e) <= tolerance for d in detected))
+    precision = hit / len(detected) if detected else (1.0 if not expected else 0.0)
+    recall = found / len(expected) if expected else 1.0
+    return precision, recall
+
+
+# 실행 함수는 (이벤트 목록, 실제로 디코딩한 프레임 수)를 반환합니다.
+# 첫 결함에서 멈추는 검출기(detect_black_screen)는 동영상 일부만 읽으므로 fps 는 읽은 프레임 수로 계산
+
+
+def _engine_runner(detector_factory):
+    def run(path):
+        report = analyze_video(path, detector_factory())
+        return [event for events in report["events"].values() for event in events], report["frame_count"]
+    return run
+
+
+def _decoded_frames(profiler):
+    # 디코딩 다음 단계가 호출된 횟수 = 읽기에 성공한 프레임 수 (루프 밖에서 읽은 첫 프레임은 제외)
+    counts = [count for stage, count in profiler.counts.items() if stage not in ("loop", "decode")]
+    return max(counts, default=0)
+
+
+def _legacy_runner(func, **kwargs):
+    def run(path):
+        sink = ListEventSink()
+        profiler = StageProfiler()
+        func(path, sink=sink, profiler=profiler, **kwargs)
+        sink.close()
+        return sink.events, _decoded_frames(profiler)
+    return run
+
+
+# (이름, 정답 키, 실행 함수). 정답 키가 None 이면 정확도는 계산하지 않음
+BENCHMARKS = [
+    ("engine.blink", "blink", _engine_runner(lambda: [BlinkDetector()])),
+    ("engine.black_screen", "black_screen", _engine_runner(lambda: [BlackScreenDetector()])),
+    ("engine.noise", "noise", _engine_runner(lambda: [NoiseDetector()])),
+    ("engine.glitch", "glitch", _engine_runner(lambda: [GlitchDetector()])),
+    ("engine.tile_glitch", "tile_glitch", _engine_runner(lambda: [TileGlitchDetector()])),
+    ("engine.all", None, _engine_runner(default_detectors)),
+    ("blink.detectBlink", "blink", _legacy_runner(detectBlink)),
+    ("cam_detectBlack.detect_black_screen", "black_screen", _legacy_runner(detect_black_screen)),
+    ("cam_detectBlack.find_black_intervals", "black_interval", _legacy_runner(find_black_intervals)),
+    ("cam_anomy.assessment", "noise", _legacy_runner(assessment, preview_every=0)),
+    ("cam_findBroken.checkSignal", "glitch", _legacy_runner(checkSignal, preview_every=0)),
+]
+
+
+def run_benchmarks(resolutions=("720p",), frames=300, workdir=None, measure_memory=True, names=None):
+    """
+    해상도별 합성 동영상을 만들고 각 검출기의 속도, 메모리, 정확도를 측정합니다.
+
+    Returns:
+        dict: "해상도/검출기" 별 {"fps", "frames", "seconds", "peak_mb", "precision", "recall"}.
+              fps 는 검출기가 실제로 디코딩한 프레임 수(frames) 기준입니다.
+    """
+    workdir = workdir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_videos")
+    if not os.path.exists(workdir):
+        os.makedirs(workdir)
+
+    results = {}
+    for resolution in resolutions:
+        path = os.path.join(workdir, f"synthetic_{resolution}_{frames}.avi")
+        truth = generate_video(path, resolution, frames)
+        for name, truth_key, run in BENCHMARKS:
+            if names and name not in names:
+                continue
+            start = time.perf_counter()
+            events, decoded = run(path)
+            seconds = time.perf_counter() - start
+
+            result = {"fps": decoded / seconds if seconds else 0.0, "frames": decoded, "seconds": seconds}
+            if measure_memory:
+                # tracemalloc 은 실행 속도를 떨어뜨리므로 시간 측정과 따로 한 번 더 실행
+                tracemalloc.start()
+                run(path)
+                result["peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            if truth_key is not None:
+                detected = [event["frame"] for event in events]
+                result["precision"], result["recall"] = precision_recall(detected, truth[truth_key])
+            results[f"{resolution}/{name}"] = result
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=0.1):
+    """
+    기준 결과와 비교하여 속도가 tolerance 비율 이상 떨어졌거나 재현율이 떨어진 항목을 찾습니다.
+
+    Returns:
+        list: 회귀 설명 문자열 목록
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["fps"] < base["fps"] * (1 - tolerance):
+            regressions.append(f"{key}: fps {base['fps']:.1f} -> {result['fps']:.1f}")
+        if "recall" in base and result.get("recall", 1.0) < base["recall"]:
+            regressions.append(f"{key}: recall {base['recall']:.2f} -> {result['recall']:.2f}")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'benchmark':48} {'fps':>9} {'peak MB':>8} {'prec':>6} {'recall':>6}")
+    for key, result in results.items():
+        peak = f"{result['peak_mb']:.1f}" if "peak_mb" in result else "-"
+        precision = f"{result['precision']:.2f}" if "precision" in result else "-"
+        recall = f"{result['recall']:.2f}" if "recall" in result else "-"
+        print(f"{key:48} {result['fps']:9.1f} {peak:>8} {precision:>6} {recall:>6}")
+
+
+# 사용 예제
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검출기 성능 측정")
+    parser.add_argument("--resolutions", nargs="+", default=["720p"], choices=sorted(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--only", nargs="+", default=None, help="측정할 항목 이름")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준으로 저장")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.resolutions, args.frames, measure_memory=not args.no_memory, names=args.only)
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline saved: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f))
+        for line in regressions:
+            print("REGRESSION", line)
+        if not regressions:
+            print("no regressions")
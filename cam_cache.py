@@ -0,0 +1,148 @@
+import hashlib
+import json
+import numpy as np
+import os
+import sys
+
+from cam_capture import resolve_backend
+from cam_stats import compute_frame_stats
+
+# 저장 형식이 바뀌면 올려서 예전 캐시를 무시하도록 함
+CACHE_VERSION = 3
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feature_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+HASH_INDEX_FILE = "hashes.json"
+
+
+def file_hash(video_path, chunk_size=1024 * 1024):
+    # 동영상 파일 내용 전체의 SHA-256
+    digest = hashlib.sha256()
+    with open(video_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached_file_hash(video_path, cache_dir):
+    # 같은 파일(경로, 크기, 수정 시각)을 다시 해시하지 않도록 결과를 기억해 둠
+    index_path = os.path.join(cache_dir, HASH_INDEX_FILE)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    st = os.stat(video_path)
+    abs_path = os.path.abspath(video_path)
+    entry = index.get(abs_path)
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+
+    digest = file_hash(video_path)
+    index[abs_path] = [st.st_size, st.st_mtime_ns, digest]
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return digest
+
+
+def cache_key(digest, **params):
+    """
+    파일 해시와 디코딩/통계 파라미터로 캐시 키를 만듭니다.
+
+    Args:
+        digest (str): 동영상 파일의 내용 해시.
+        **params: 통계 계산에 사용한 파라미터 (black_level, diff_threshold 등).
+
+    Returns:
+        str: 캐시 파일 이름으로 쓰는 키.
+    """
+    text = json.dumps({"version": CACHE_VERSION, "file": digest, "params": params}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def evict_cache(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    캐시 디렉터리 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+    캐시를 읽을 때마다 수정 시각을 갱신하므로 수정 시각 순서가 곧 LRU 순서입니다.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".npy"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def load_or_compute_stats(video_path, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                          black_level=10, diff_threshold=25, analysis_width=None, roi=None):
+    """
+    프레임 통계 배열을 캐시에서 읽고, 없으면 계산해서 캐시에 저장합니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        cache_dir (str): 캐시 디렉터리
+        max_bytes (int): 캐시 디렉터리 최대 크기. 넘으면 LRU 순서로 지웁니다.
+        black_level (int): 검은 픽셀 판단 기준 밝기.
+        diff_threshold (int): 픽셀 변화 판단 기준 (0-255).
+        analysis_width (int): 통계 계산에 쓰는 가로 폭. None 이면 원본 해상도.
+        roi (tuple): 관심 영역 (x, y, w, h). None 이면 전체 화면.
+
+    Returns:
+        np.ndarray: STATS_DTYPE 구조체 배열. 캐시에서 읽은 경우 읽기 전용 memmap 입니다.
+                    파일을 열 수 없으면 None.
+    """
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+
+    digest = _cached_file_hash(video_path, cache_dir)
+    # 디코딩 백엔드마다 흑백 값(Y 평면 / BGR->GRAY)이 조금씩 달라 통계도 달라지므로 키에 포함
+    key = cache_key(digest, black_level=black_level, diff_threshold=diff_threshold,
+                    analysis_width=analysis_width, roi=list(roi) if roi else None,
+                    backend=resolve_backend(gray=True, path=video_path))
+    cache_path = os.path.join(cache_dir, key + ".npy")
+
+    if os.path.exists(cache_path):
+        # 사용 시각 갱신 (LRU)
+        os.utime(cache_path)
+        return np.load(cache_path, mmap_mode="r")
+
+    stats = compute_frame_stats(video_path, black_level, diff_threshold, analysis_width, roi)
+    if stats is None:
+        return None
+
+    # 중간에 중단되어도 깨진 캐시가 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, stats)
+    os.replace(tmp_path, cache_path)
+    evict_cache(cache_dir, max_bytes)
+    return stats
+
+
+# 사용 예제
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    print("target file:", video_file)
+    stats = load_or_compute_stats(video_file)
+    if stats is not None:
+        print(f"frames: {len(stats)}")
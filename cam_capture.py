@@ -0,0 +1,223 @@
+import cv2
+import numpy as np
+
+# open_capture 의 기본 설정. configure()로 실행 단위로 바꿀 수 있음
+#   backend: "auto", "ffmpeg", "pyav"
+#   threads: 디코더 스레드 수 (None 이면 백엔드 기본값)
+DEFAULTS = {"backend": "auto", "threads": None}
+
+# 제한 범위(16-235) Y 값을 BGR->GRAY 변환과 같은 전체 범위(0-255)로 바꾸는 표
+LIMITED_TO_FULL = np.clip(np.round((np.arange(256) - 16) * 255 / 219), 0, 255).astype(np.uint8)
+
+# set()에서 이보다 멀리 앞으로 갈 때만 키프레임 탐색 (가까우면 디코딩하며 건너뛰는 것이 빠름)
+SEEK_MIN_FRAMES = 64
+
+# Y 평면을 그대로 밝기로 쓸 수 있는 픽셀 형식
+PLANAR_YUV_FORMATS = ("yuv420p", "yuvj420p", "yuv422p", "yuvj422p", "yuv444p", "yuvj444p", "nv12", "nv21")
+
+
+def configure(backend=None, threads=None):
+    """
+    이후 열리는 모든 캡처의 기본 백엔드와 디코더 스레드 수를 정합니다.
+
+    Args:
+        backend (str): "auto", "ffmpeg" 또는 "pyav"
+        threads (int): 디코더 스레드 수
+    """
+    if backend is not None:
+        DEFAULTS["backend"] = backend
+    if threads is not None:
+        DEFAULTS["threads"] = threads
+
+
+def pyav_available():
+    try:
+        import av  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PyAVCapture:
+    """
+    PyAV 로 디코딩하는 cv2.VideoCapture 호환 캡처입니다.
+
+    gray=True 이면 BGR 로 변환하지 않고 디코더가 만든 Y(밝기) 평면을 바로 돌려주므로
+    검출기에서 cv2.cvtColor 가 필요 없습니다. 제한 범위 영상은 BGR->GRAY 결과와 같은 범위로 맞춥니다.
+    """
+
+    def __init__(self, path, threads=None, gray=False):
+        import av
+        import av.error
+
+        self.path = path
+        self.gray = gray
+        self.threads = threads
+        self.pos = 0
+        self.last_time = 0.0
+        self.pending = None
+        try:
+            self.container = av.open(path)
+        except (OSError, av.error.FFmpegError):
+            self.opened = False
+            return
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = "AUTO"
+        if threads:
+            self.stream.codec_context.thread_count = threads
+        self.frames = self.container.decode(self.stream)
+        self.opened = True
+
+    def _next(self):
+        if self.pending is not None:
+            # 탐색 후 위치 확인용으로 미리 디코딩해 둔 프레임
+            frame, self.pending = self.pending, None
+        else:
+            try:
+                frame = next(self.frames)
+            except (StopIteration, EOFError):
+                return None
+        self.pos += 1
+        if frame.time is not None:
+            self.last_time = frame.time
+        return frame
+
+    def _luma(self, frame):
+        if frame.format.name not in PLANAR_YUV_FORMATS:
+            return frame.to_ndarray(format="gray")
+        plane = frame.planes[0]
+        # 줄 끝의 여백(line_size)을 잘라낸 Y 평면 뷰
+        y = np.frombuffer(plane, np.uint8).reshape(plane.height, plane.line_size)[:, :plane.width]
+        full_range = frame.format.name.startswith("yuvj") or getattr(frame, "color_range", None) == 2
+        if full_range:
+            return np.ascontiguousarray(y)
+        return cv2.LUT(y, LIMITED_TO_FULL)
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        frame = self._next()
+        if frame is None:
+            return False, None
+        if self.gray:
+            return True, self._luma(frame)
+        return True, frame.to_ndarray(format="bgr24")
+
+    def grab(self):
+        return self.opened and self._next() is not None
+
+    def _frame_index(self, frame):
+        # 프레임 pts 를 프레임 번호로 변환 (알 수 없으면 None)
+        rate = self.stream.average_rate
+        if frame.pts is None or not rate or self.stream.time_base is None:
+            return None
+        start = self.stream.start_time or 0
+        return int(round(float((frame.pts - start) * self.stream.time_base * rate)))
+
+    def _seek_keyframe(self, target):
+        """
+        target 이전의 가장 가까운 키프레임으로 이동하고 그 프레임을 pending 으로 둡니다.
+        위치를 알 수 없거나 target 을 지나친 경우 처음으로 되돌립니다.
+        """
+        rate = self.stream.average_rate
+        time_base = self.stream.time_base
+        if target > 0 and rate and time_base:
+            pts = int(target / rate / time_base) + (self.stream.start_time or 0)
+            self.container.seek(pts, stream=self.stream, backward=True, any_frame=False)
+            self.frames = self.container.decode(self.stream)
+            self.pending = None
+            try:
+                frame = next(self.frames)
+            except (StopIteration, EOFError):
+                frame = None
+            index = self._frame_index(frame) if frame is not None else None
+            if index is not None and index <= target:
+                self.pending = frame
+                self.pos = index
+                return
+        self.container.seek(0)
+        self.frames = self.container.decode(self.stream)
+        self.pending = None
+        self.pos = 0
+
+    def set(self, prop_id, value):
+        if prop_id != cv2.CAP_PROP_POS_FRAMES or not self.opened:
+            return False
+        # 뒤로 가거나 멀리 앞으로 가면 키프레임으로 이동한 뒤, 남은 프레임은 변환 없이 디코딩만 하며 건너뜀
+        target = int(value)
+        if target < self.pos or target - self.pos > SEEK_MIN_FRAMES:
+            self._seek_keyframe(target)
+        while self.pos < target and self.grab():
+            pass
+        return True
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if not self.opened:
+            return 0.0
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.stream.average_rate or 0)
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.stream.frames)
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.stream.codec_context.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.stream.codec_context.height)
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            return float(self.last_time * 1000)
+        return 0.0
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        if self.opened:
+            self.container.close()
+            self.opened = False
+
+
+def _open_ffmpeg(path, threads):
+    params = []
+    if threads and hasattr(cv2, "CAP_PROP_N_THREADS"):
+        params = [cv2.CAP_PROP_N_THREADS, threads]
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
+        # 카메라 번호 등 FFmpeg 로 열 수 없는 소스는 OpenCV 가 백엔드를 고르게 함
+        cap = cv2.VideoCapture(path)
+    return cap
+
+
+def resolve_backend(backend=None, gray=False, path=""):
+    """
+    open_capture 가 실제로 사용할 백엔드 이름("ffmpeg" 또는 "pyav")을 돌려줍니다.
+    백엔드마다 흑백 값이 조금씩 다르므로 통계 캐시 키 등에 사용합니다.
+    """
+    backend = backend or DEFAULTS["backend"]
+    if backend == "auto":
+        backend = "pyav" if gray and isinstance(path, str) and pyav_available() else "ffmpeg"
+    return backend
+
+
+def open_capture(path, backend=None, threads=None, gray=False):
+    """
+    설정에 맞는 디코딩 백엔드로 동영상을 엽니다.
+
+    Args:
+        path (str): 동영상 경로
+        backend (str): "auto", "ffmpeg", "pyav". None 이면 configure()로 정한 기본값
+        threads (int): 디코더 스레드 수. None 이면 configure()로 정한 기본값
+        gray (bool): 밝기만 필요한 경우 True. PyAV 백엔드에서는 Y 평면을 흑백 프레임으로 바로 돌려주고,
+                     FFmpeg 백엔드에서는 BGR 프레임을 그대로 돌려줍니다 (cam_frame.to_gray 로 처리).
+
+    Returns:
+        cv2.VideoCapture 또는 PyAVCapture
+    """
+    backend = resolve_backend(backend, gray, path)
+    threads = threads or DEFAULTS["threads"]
+
+    if backend == "pyav":
+        return PyAVCapture(path, threads, gray)
+    if backend == "ffmpeg":
+        return _open_ffmpeg(path, threads)
+    raise ValueError(f"Unsupported backend: {backend}")
@@ -1,32 +1,55 @@
 import cv2
 import os
-def detect_black_screen(video_path, threshold=10, duration_frames=10):
+
+from cam_capture import open_capture
+from cam_events import make_event
+from cam_frame import reduce_frame
+from cam_profile import NULL_PROFILER
+from cam_source import FrameSource, seek_frame
+
+def detect_black_screen(video_path, threshold=10, duration_frames=10, analysis_width=None, roi=None, sink=None,
+                        profiler=None):
+    # analysis_width: 밝기 계산에 쓰는 가로 폭 (None 이면 원본), roi: 검사할 영역 (x, y, w, h)
+    # sink: cam_events 의 EventSink. 지정하면 print 대신 이벤트로 기록
+    # profiler: cam_profile.StageProfiler. 지정하면 단계별 처리 시간을 기록
+    # 합격/불합격 판정용 빠른 모드: 첫 블랙 구간이 확인되는 즉시 디코딩을 멈추고 True 를 반환
+    # 모든 블랙 구간이 필요하면 find_black_intervals 를 사용
+    profiler = profiler or NULL_PROFILER
     
-    cap = cv2.VideoCapture(video_path) # 동영상 파일 열기
+    cap = FrameSource(video_path, gray=True) # 동영상 파일 열기 (백그라운드 디코딩)
     black_frames_count = 0
     is_event_triggered = False
     count=0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
 
     while cap.isOpened():
+        profiler.lap("loop")
         ret, frame = cap.read()
+        profiler.lap("decode")
         if not ret:
             break
 
         
         # 흑백 이미지로 변환
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray_frame = reduce_frame(frame, roi, analysis_width)
+        profiler.lap("gray")
 
         # 평균 밝기 계산
         mean_brightness = gray_frame.mean()
+        profiler.lap("mean")
 
         # 블랙화면 감지: 평균 밝기가 임계값 이하이고, 일정 프레임 이상 지속될 때
-        if(mean_brightness<60):
+        if(mean_brightness<60 and sink is None):
             print("checkdata: ",count,":",mean_brightness, threshold)
         count+=1            
         if mean_brightness < threshold:
             black_frames_count += 1
             if black_frames_count >= duration_frames:
-                print(f"이벤트 발생: 블랙화면 감지됨 (프레임 {cap.get(cv2.CAP_PROP_POS_FRAMES)})")
+                if sink is not None:
+                    sink.emit(make_event(count - 1, "black_screen", "mean_brightness", mean_brightness,
+                                         file=video_path, timestamp=(count - 1) / fps if fps else None))
+                else:
+                    print(f"이벤트 발생: 블랙화면 감지됨 (프레임 {count})")
                 is_event_triggered = True
                 # 여기서 이벤트 발생 시 추가 동작을 수행할 수 있습니다.
                 # 예: 이벤트 기록, 특정 구간 녹화, 알림 전송 등
@@ -34,9 +57,166 @@ def detect_black_screen(video_path, threshold=10, duration_frames=10):
         else:
             black_frames_count = 0 # 블랙화면 카운트 초기화
 
+    # 미리 디코딩하던 스레드도 여기서 멈추므로 나머지 프레임은 디코딩하지 않음
     cap.release()
     return is_event_triggered
 
+def _black_interval(start, end, brightness_min, brightness_sum):
+    # 블랙 구간 정보 (end 는 구간의 마지막 프레임 번호, 포함)
+    return {"start": start, "end": end,
+            "min_brightness": float(brightness_min),
+            "mean_brightness": float(brightness_sum / (end - start + 1))}
+
+
+def find_black_intervals(video_path, threshold=10, duration_frames=10, analysis_width=None, roi=None,
+                         sink=None, profiler=None):
+    """
+    동영상 전체를 한 번 읽으면서 duration_frames 이상 이어지는 모든 블랙 구간을 찾습니다.
+    연속된 어두운 프레임의 시작, 최소/합계 밝기만 유지하므로 동영상 길이와 관계없이 메모리가 일정합니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        threshold (float): 블랙 화면으로 판단하는 평균 밝기
+        duration_frames (int): 블랙 구간으로 보고하는 최소 프레임 수
+        analysis_width (int): 밝기 계산에 쓰는 가로 폭 (None 이면 원본)
+        roi (tuple): 검사할 영역 (x, y, w, h)
+        sink (EventSink): 지정하면 구간마다 이벤트를 기록 (cam_events)
+        profiler (StageProfiler): 지정하면 단계별 처리 시간을 기록 (cam_profile)
+
+    Returns:
+        list: {"start", "end", "min_brightness", "mean_brightness"} 구간 목록. end 는 마지막 블랙 프레임 번호입니다.
+    """
+    profiler = profiler or NULL_PROFILER
+    cap = FrameSource(video_path, gray=True) # 동영상 파일 열기 (백그라운드 디코딩)
+    intervals = []
+    if not cap.isOpened():
+        print(f"Error: Could not open video file {video_path}")
+        return intervals
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+
+    def close_run(start, end, brightness_min, brightness_sum):
+        if end - start + 1 < duration_frames:
+            return
+        interval = _black_interval(start, end, brightness_min, brightness_sum)
+        intervals.append(interval)
+        if sink is not None:
+            sink.emit(make_event(start, "black_screen", "duration_frames", end - start + 1, file=video_path,
+                                 timestamp=start / fps if fps else None, end=end,
+                                 min_brightness=interval["min_brightness"],
+                                 mean_brightness=interval["mean_brightness"]))
+
+    run_start = None
+    index = 0
+    while True:
+        profiler.lap("loop")
+        ret, frame = cap.read()
+        profiler.lap("decode")
+        if not ret:
+            break
+        brightness = reduce_frame(frame, roi, analysis_width).mean()
+        profiler.lap("mean")
+        if brightness < threshold:
+            if run_start is None:
+                run_start, run_min, run_sum = index, brightness, 0.0
+            run_min = min(run_min, brightness)
+            run_sum += brightness
+        elif run_start is not None:
+            close_run(run_start, index - 1, run_min, run_sum)
+            run_start = None
+        index += 1
+
+    # 파일 끝까지 블랙 구간이 이어진 경우
+    if run_start is not None:
+        close_run(run_start, index - 1, run_min, run_sum)
+    cap.release()
+    return intervals
+
+
+def detect_black_intervals_sampled(video_path, threshold=10, duration_frames=10, step=None,
+                                   analysis_width=None, roi=None):
+    """
+    step 프레임마다 한 프레임만 디코딩하고 나머지는 grab()으로 건너뛰면서 블랙 구간을 찾습니다.
+
+    샘플 프레임이 threshold 보다 어두우면 직전 샘플 다음 프레임으로 돌아가
+    블랙 구간이 끝날 때까지 모든 프레임을 디코딩하므로 구간의 시작/끝 프레임 번호는 정확합니다.
+    step 이 duration_frames 이하이면 duration_frames 이상 이어지는 구간은 반드시 샘플에 걸리므로
+    모든 프레임을 검사하는 것과 같은 결과가 나옵니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        threshold (float): 블랙 화면으로 판단하는 평균 밝기
+        duration_frames (int): 블랙 구간으로 보고하는 최소 프레임 수
+        step (int): 샘플 간격. None 이면 duration_frames 이고, duration_frames 보다 클 수 없습니다.
+        analysis_width (int): 밝기 계산에 쓰는 가로 폭 (None 이면 원본)
+        roi (tuple): 검사할 영역 (x, y, w, h)
+
+    Returns:
+        list: {"start", "end", "min_brightness", "mean_brightness"} 구간 목록. end 는 마지막 블랙 프레임 번호입니다.
+    """
+    cap = open_capture(video_path, gray=True)
+    intervals = []
+    if not cap.isOpened():
+        print(f"Error: Could not open video file {video_path}")
+        return intervals
+
+    step = max(1, min(step or duration_frames, duration_frames))
+    pos = 0             # 다음에 읽을 프레임 번호
+    sample = 0          # 다음 샘플 프레임 번호
+    prev_sample = -1    # 밝은 것으로 확인된 마지막 샘플
+    try:
+        while True:
+            # 샘플 위치까지는 디코딩 없이 건너뜀
+            while pos < sample and cap.grab():
+                pos += 1
+            if pos < sample:
+                break
+            ret, frame = cap.read()
+            if not ret:
+                break
+            pos += 1
+
+            if reduce_frame(frame, roi, analysis_width).mean() >= threshold:
+                prev_sample = sample
+                sample += step
+                continue
+
+            # 어두운 샘플: 직전 샘플 다음 프레임부터 블랙 구간이 끝날 때까지 모두 디코딩
+            index = prev_sample + 1
+            if not seek_frame(cap, index):
+                break
+            run_start = None
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                brightness = reduce_frame(frame, roi, analysis_width).mean()
+                if brightness < threshold:
+                    if run_start is None:
+                        run_start, run_min, run_sum = index, brightness, 0.0
+                    run_min = min(run_min, brightness)
+                    run_sum += brightness
+                else:
+                    if run_start is not None and index - run_start >= duration_frames:
+                        intervals.append(_black_interval(run_start, index - 1, run_min, run_sum))
+                    run_start = None
+                    if index > sample:
+                        break
+                index += 1
+
+            if not ret:
+                # 파일 끝까지 블랙 구간이 이어진 경우
+                if run_start is not None and index - run_start >= duration_frames:
+                    intervals.append(_black_interval(run_start, index - 1, run_min, run_sum))
+                break
+
+            # index 번 프레임은 밝은 것으로 확인됨
+            pos = index + 1
+            prev_sample = index
+            sample = index + step
+    finally:
+        cap.release()
+    return intervals
+
 # 사용 예시
 # video_file = "your_video.mp4" # 분석할 동영상 파일 경로
 # if detect_black_screen(video_file):
@@ -60,7 +240,7 @@ if __name__ == "__main__":
     video_file = "input.mp4"  # 처리할 동영상 파일명
     output_folder = "output"  # 이미지를 저장할 폴더명
     folder = checkFoloder()
-    video_file = folder +"\\input.mp4"
-#    output_folder =folder +"\output"
+    video_file = os.path.join(folder, "input.mp4")
+#    output_folder =os.path.join(folder, "output")
     print("target file:",video_file)
     detect_black_screen(video_file,60,1)
\ No newline at end of file
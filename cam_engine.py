@@ -0,0 +1,304 @@
+import cv2
+import os
+import sys
+
+from cam_events import make_event
+from cam_findBroken import detect_tile_glitch, pixel_change_rate, tile_stddev
+from cam_frame import reduce_frame
+from cam_phash import dhash
+from cam_source import FrameSource
+
+
+class FrameDetector:
+    """
+    분석 엔진에 꽂아 쓰는 프레임 검출기의 기본 클래스입니다.
+
+    엔진은 프레임을 한 번만 디코딩하고 흑백 변환도 한 번만 한 뒤
+    모든 검출기의 process()에 같은 프레임을 넘겨줍니다.
+    roi 가 (x, y, w, h) 이면 그 영역만 잘라낸 흑백 프레임을 받습니다.
+    """
+    name = "base"
+    roi = None
+
+    def reset(self):
+        # 새 동영상 분석을 시작할 때 내부 상태 초기화
+        pass
+
+    def process(self, index, frame, gray):
+        """
+        프레임 하나를 검사합니다.
+
+        Args:
+            index (int): 프레임 번호 (0부터 시작).
+            frame (np.array): 원본 BGR 프레임. 다음 프레임을 읽으면 재사용되므로 보관하려면 복사해야 합니다.
+            gray (np.array): ROI 를 잘라내고 분석 해상도로 줄인 흑백 프레임.
+
+        Returns:
+            list: 이 프레임에서 발생한 이벤트 목록.
+        """
+        return []
+
+    def finish(self, frame_count):
+        # 동영상이 끝났을 때 남은 이벤트를 반환
+        return []
+
+
+class BlinkDetector(FrameDetector):
+    """이전 프레임과의 평균 밝기 차이로 깜빡임을 감지합니다. (blink.detectBlink)"""
+    name = "blink"
+
+    def __init__(self, blink_threshold=50.0, roi=None):
+        self.blink_threshold = blink_threshold
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.prev_avg_luminosity = None
+
+    def process(self, index, frame, gray):
+        current_avg_luminosity = gray.mean()
+        prev_avg_luminosity = self.prev_avg_luminosity
+        self.prev_avg_luminosity = current_avg_luminosity
+        if prev_avg_luminosity is None:
+            return []
+
+        luminosity_diff = abs(current_avg_luminosity - prev_avg_luminosity)
+        if luminosity_diff > self.blink_threshold:
+            return [make_event(index, self.name, "luminosity_diff", luminosity_diff)]
+        return []
+
+
+class BlackScreenDetector(FrameDetector):
+    """
+    평균 밝기가 threshold 미만인 프레임이 duration_frames 이상 이어지면 블랙화면으로 판단합니다.
+    (cam_detectBlack.detect_black_screen)
+
+    첫 이벤트에서 멈추지 않고, 블랙 구간마다 조건을 만족한 프레임에서 한 번씩 보고합니다.
+    """
+    name = "black_screen"
+
+    def __init__(self, threshold=10, duration_frames=10, roi=None):
+        self.threshold = threshold
+        self.duration_frames = duration_frames
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.black_frames_count = 0
+
+    def process(self, index, frame, gray):
+        mean_brightness = gray.mean()
+        if mean_brightness >= self.threshold:
+            self.black_frames_count = 0 # 블랙화면 카운트 초기화
+            return []
+
+        self.black_frames_count += 1
+        if self.black_frames_count == self.duration_frames:
+            return [make_event(index, self.name, "mean_brightness", mean_brightness)]
+        return []
+
+
+class NoiseDetector(FrameDetector):
+    """
+    평균 밝기와 표준 편차로 화면 출력 없음/노이즈를 판단합니다. (cam_anomy.detect_screen_anomaly)
+
+    원본은 BGR 프레임의 첫 채널을 사용하지만, 엔진에서는 이미 만들어 둔 흑백 프레임을 사용합니다.
+    """
+    name = "noise"
+
+    def __init__(self, black_level=10, noise_std=100, roi=None):
+        self.black_level = black_level
+        self.noise_std = noise_std
+        self.roi = roi
+
+    def process(self, index, frame, gray):
+        mean, std_dev = cv2.meanStdDev(gray)
+        if mean[0][0] < self.black_level:
+            return [make_event(index, self.name, "mean", mean[0][0])]
+        if std_dev[0][0] > self.noise_std:
+            return [make_event(index, self.name, "stddev", std_dev[0][0])]
+        return []
+
+
+class GlitchDetector(FrameDetector):
+    """연속된 두 프레임의 픽셀 변화율로 화면 깨짐을 감지합니다. (cam_findBroken.detect_screen_glitch)"""
+    name = "glitch"
+
+    def __init__(self, threshold=25, min_change_percent=0.1, roi=None):
+        self.threshold = threshold
+        self.min_change_percent = min_change_percent
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.prev_gray = None
+
+    def process(self, index, frame, gray):
+        prev_gray = self.prev_gray
+        # 엔진이 매 프레임 새 흑백 배열을 만들기 때문에 복사 없이 참조만 보관
+        self.prev_gray = gray
+        if prev_gray is None:
+            return []
+
+        change_rate = pixel_change_rate(prev_gray, gray, self.threshold)
+        if change_rate > self.min_change_percent:
+            return [make_event(index, self.name, "change_percent", change_rate)]
+        return []
+
+
+class TileGlitchDetector(FrameDetector):
+    """
+    블록별 변화율로 국소적인 화면 깨짐을 감지합니다. (cam_findBroken.detect_tile_glitch)
+    블록 좌표는 검출기가 받은 흑백 프레임(ROI, 분석 해상도 적용 후) 기준입니다.
+    """
+    name = "tile_glitch"
+
+    def __init__(self, tile=64, threshold=25, min_tile_change=0.5, roi=None):
+        self.tile = tile
+        self.threshold = threshold
+        self.min_tile_change = min_tile_change
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.prev_gray = None
+        self.prev_std = None
+
+    def process(self, index, frame, gray):
+        prev_gray, prev_std = self.prev_gray, self.prev_std
+        # 블록별 표준 편차는 프레임마다 한 번만 계산하고 다음 프레임에서 이전 값으로 씀
+        current_std = tile_stddev(gray, self.tile)
+        self.prev_gray, self.prev_std = gray, current_std
+        tiles = detect_tile_glitch(prev_gray, gray, self.tile, self.threshold, self.min_tile_change,
+                                   prev_std=prev_std, current_std=current_std)
+        if not tiles:
+            return []
+        worst = max(tile["change_ratio"] for tile in tiles)
+        return [make_event(index, self.name, "tile_change_ratio", worst, tiles=tiles)]
+
+
+class FreezeDetector(FrameDetector):
+    """
+    같은 화면이 min_frames 이상 이어지면 정지 화면(영상 멈춤)으로 판단합니다.
+
+    이웃한 프레임의 dHash 해밍 거리가 max_distance 이하이면 같은 화면으로 봅니다.
+    정지 구간마다 조건을 만족한 프레임에서 한 번씩 보고합니다.
+    """
+    name = "freeze"
+
+    def __init__(self, max_distance=2, min_frames=30, roi=None):
+        self.max_distance = max_distance
+        self.min_frames = min_frames
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.prev_hash = None
+        self.frozen_frames_count = 0
+
+    def process(self, index, frame, gray):
+        frame_hash = dhash(gray)
+        prev_hash = self.prev_hash
+        self.prev_hash = frame_hash
+        if prev_hash is None or bin(frame_hash ^ prev_hash).count("1") > self.max_distance:
+            self.frozen_frames_count = 1
+            return []
+
+        self.frozen_frames_count += 1
+        if self.frozen_frames_count == self.min_frames:
+            return [make_event(index, self.name, "frozen_frames", self.frozen_frames_count)]
+        return []
+
+
+def default_detectors():
+    # 기본 검사 4종: 깜빡임, 블랙화면, 노이즈, 화면 깨짐
+    return [BlinkDetector(), BlackScreenDetector(), NoiseDetector(), GlitchDetector()]
+
+
+def process_frame(index, frame, detectors, analysis_width=None):
+    """
+    디코딩된 프레임 하나를 흑백으로 변환한 뒤 모든 검출기에 넘깁니다.
+    같은 ROI 를 쓰는 검출기끼리는 줄인 흑백 프레임을 한 번만 만들어 공유합니다.
+
+    Returns:
+        list: 모든 검출기가 이 프레임에서 보고한 이벤트 목록.
+    """
+    grays = {}
+    events = []
+    for detector in detectors:
+        gray = grays.get(detector.roi)
+        if gray is None:
+            gray = grays[detector.roi] = reduce_frame(frame, detector.roi, analysis_width)
+        events.extend(detector.process(index, frame, gray))
+    return events
+
+
+def analyze_video(video_path, detectors=None, analysis_width=None, sink=None):
+    """
+    동영상을 한 번만 디코딩하면서 여러 검출기를 동시에 실행합니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        detectors (list): FrameDetector 목록. None 이면 default_detectors()를 사용합니다.
+        analysis_width (int): 통계 계산에 쓰는 가로 폭 (예: 320). None 이면 원본 해상도.
+        sink (EventSink): 이벤트를 내보낼 곳 (cam_events). 지정하면 보고서에는 이벤트를 모으지 않습니다.
+
+    Returns:
+        dict: {"file", "frame_count", "events"} 형태의 보고서.
+              events 는 프레임 번호별 이벤트 목록입니다. 파일을 열 수 없으면 None.
+    """
+    if detectors is None:
+        detectors = default_detectors()
+
+    # 검출기는 흑백 프레임만 사용하므로 백엔드가 지원하면 Y 평면을 바로 받음
+    cap = FrameSource(video_path, gray=True)
+    if not cap.isOpened():
+        print(f"Error: Could not open video file {video_path}")
+        return None
+
+    for detector in detectors:
+        detector.reset()
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    events = {}
+
+    def add(event):
+        event["file"] = video_path
+        if fps:
+            event["timestamp"] = event["frame"] / fps
+        if sink is not None:
+            sink.emit(event)
+        else:
+            events.setdefault(event["frame"], []).append(event)
+
+    count = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            for event in process_frame(count, frame, detectors, analysis_width):
+                add(event)
+            count += 1
+
+        for detector in detectors:
+            for event in detector.finish(count):
+                add(event)
+    finally:
+        cap.release()
+
+    return {"file": video_path, "frame_count": count, "events": dict(sorted(events.items()))}
+
+
+# 사용 예제
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    print("target file:", video_file)
+    report = analyze_video(video_file)
+    if report is not None:
+        for frame_index, frame_events in report["events"].items():
+            for event in frame_events:
+                print(f"{frame_index}: {event['detector']} {event['metric']}={event['value']:.2f}")
+        print(f"total frames: {report['frame_count']}")
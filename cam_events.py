@@ -0,0 +1,141 @@
+import json
+
+# 모든 이벤트가 공통으로 가지는 필드
+EVENT_FIELDS = ("file", "frame", "timestamp", "detector", "metric", "value")
+
+
+def make_event(frame_index, detector, metric, value, file=None, timestamp=None, **details):
+    """
+    검출기가 보고하는 이벤트 하나를 만듭니다.
+
+    Args:
+        frame_index (int): 이벤트가 발생한 프레임 번호 (0부터 시작).
+        detector (str): 이벤트를 만든 검출기 이름.
+        metric (str): 판단에 사용한 측정값 이름.
+        value (float): 측정값.
+        file (str): 분석한 동영상 경로 (모르면 None).
+        timestamp (float): 동영상 기준 시각(초) 또는 실시간 캡처 시각 (모르면 None).
+        **details: 검출기별 추가 정보 (예: 깨진 블록 좌표).
+
+    Returns:
+        dict: 이벤트 정보.
+    """
+    event = {"file": file, "frame": frame_index, "timestamp": timestamp,
+             "detector": detector, "metric": metric, "value": float(value)}
+    event.update(details)
+    return event
+
+
+class EventSink:
+    """
+    검출기가 이벤트를 내보내는 곳의 기본 클래스입니다.
+
+    이벤트는 batch_size 개씩 모았다가 한 번에 기록하므로 프레임마다 출력하는 비용이 없습니다.
+    with 문으로 쓰거나, 끝나면 close()를 호출해서 남은 이벤트를 기록해야 합니다.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def emit(self, event):
+        self.buffer.append(event)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def emit_many(self, events):
+        for event in events:
+            self.emit(event)
+
+    def flush(self):
+        if self.buffer:
+            self._write(self.buffer)
+            self.buffer = []
+
+    def _write(self, events):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ListEventSink(EventSink):
+    """이벤트를 메모리의 리스트에 모읍니다. (같은 프로세스에서 결과를 바로 쓸 때)"""
+
+    def __init__(self, batch_size=1):
+        super().__init__(batch_size)
+        self.events = []
+
+    def _write(self, events):
+        self.events.extend(events)
+
+
+class JsonlEventSink(EventSink):
+    """이벤트를 한 줄에 하나씩 JSON 으로 기록합니다. 기존 파일이 있으면 뒤에 이어서 씁니다."""
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(batch_size)
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _write(self, events):
+        self.file.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class ParquetEventSink(EventSink):
+    """
+    이벤트를 열 단위(Parquet) 파일로 기록합니다. 배치마다 row group 하나가 됩니다.
+    공통 필드 외의 추가 정보는 "details" 열에 JSON 문자열로 들어갑니다.
+    pyarrow 가 필요합니다.
+    """
+
+    def __init__(self, path, batch_size=10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("ParquetEventSink requires pyarrow (pip install pyarrow)") from e
+
+        super().__init__(batch_size)
+        self.path = path
+        self.pa = pa
+        self.schema = pa.schema([
+            ("file", pa.string()),
+            ("frame", pa.int64()),
+            ("timestamp", pa.float64()),
+            ("detector", pa.string()),
+            ("metric", pa.string()),
+            ("value", pa.float64()),
+            ("details", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def _write(self, events):
+        columns = {name: [event.get(name) for event in events] for name in EVENT_FIELDS}
+        columns["details"] = [
+            json.dumps({k: v for k, v in event.items() if k not in EVENT_FIELDS}, ensure_ascii=False)
+            if len(event) > len(EVENT_FIELDS) else None
+            for event in events
+        ]
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+
+def open_sink(path, batch_size=None):
+    # 확장자로 기록 형식 선택 (.parquet 이면 Parquet, 그 밖에는 JSONL)
+    if path.endswith(".parquet"):
+        return ParquetEventSink(path, batch_size or 10000)
+    return JsonlEventSink(path, batch_size or 1000)
@@ -2,22 +2,24 @@ import cv2
 import numpy as np
 import os
 
-def detect_screen_glitch(prev_frame, current_frame, threshold=25, min_change_percent=0.1):
+from cam_events import make_event
+from cam_frame import to_gray
+from cam_preview import show_preview, close_preview
+from cam_profile import NULL_PROFILER
+from cam_source import open_source
+
+def pixel_change_rate(prev_frame, current_frame, threshold=25):
     """
-    연속된 두 프레임의 픽셀 변화율을 감지하여 화면 깨짐을 판단합니다.
+    두 흑백 프레임 사이에서 값이 threshold 보다 크게 바뀐 픽셀의 비율(%)을 계산합니다.
 
     Args:
         prev_frame (np.array): 이전 프레임 이미지 (흑백).
         current_frame (np.array): 현재 프레임 이미지 (흑백).
         threshold (int): 두 프레임의 픽셀값 차이를 판단하는 임계값 (0-255).
-        min_change_percent (float): 전체 화면 픽셀 대비 변화율 최소 기준 (%).
 
     Returns:
-        bool: 화면 깨짐 감지 시 True, 아니면 False.
+        float: 전체 픽셀 대비 변화된 픽셀의 비율 (%).
     """
-    if prev_frame is None:
-        return False
-
     # 1. 두 프레임의 차분 이미지 계산
     # cv2.absdiff는 두 이미지의 픽셀별 절대값 차이를 계산합니다.
     diff_image = cv2.absdiff(prev_frame, current_frame)
@@ -32,7 +34,25 @@ def detect_screen_glitch(prev_frame, current_frame, threshold=25, min_change_per
     
     # 4. 전체 픽셀 수 대비 변화율 계산
     total_pixels = thresh_diff.size
-    change_rate = (changed_pixels / total_pixels) * 100
+    return (changed_pixels / total_pixels) * 100
+
+def detect_screen_glitch(prev_frame, current_frame, threshold=25, min_change_percent=0.1):
+    """
+    연속된 두 프레임의 픽셀 변화율을 감지하여 화면 깨짐을 판단합니다.
+
+    Args:
+        prev_frame (np.array): 이전 프레임 이미지 (흑백).
+        current_frame (np.array): 현재 프레임 이미지 (흑백).
+        threshold (int): 두 프레임의 픽셀값 차이를 판단하는 임계값 (0-255).
+        min_change_percent (float): 전체 화면 픽셀 대비 변화율 최소 기준 (%).
+
+    Returns:
+        bool: 화면 깨짐 감지 시 True, 아니면 False.
+    """
+    if prev_frame is None:
+        return False
+
+    change_rate = pixel_change_rate(prev_frame, current_frame, threshold)
 
     result = None
     # 5. 변화율을 기준으로 화면 깨짐 여부 판단
@@ -43,43 +63,162 @@ def detect_screen_glitch(prev_frame, current_frame, threshold=25, min_change_per
     
     return result
 
-def checkSignal(videoFile):
+def tile_stats(frame, tile):
+    """
+    tile x tile 블록별 평균과 표준 편차를 reshape 와 합계 한 번씩으로 계산합니다.
+
+    Args:
+        frame (np.array): 흑백 프레임 (uint8). 크기는 tile 의 배수여야 합니다.
+        tile (int): 블록 한 변의 크기 (픽셀).
+
+    Returns:
+        tuple: (mean, stddev). 각각 (행 블록 수, 열 블록 수) 크기의 float64 배열.
+    """
+    rows, cols = frame.shape[0] // tile, frame.shape[1] // tile
+    blocks = frame.reshape(rows, tile, cols, tile)
+    count = tile * tile
+    # 제곱은 uint16 에 들어가고 (255^2), 제곱합은 큰 블록에서도 넘치지 않도록 uint64 로 더함
+    mean = blocks.sum(axis=(1, 3), dtype=np.uint32) / count
+    mean_square = np.square(blocks, dtype=np.uint16).sum(axis=(1, 3), dtype=np.uint64) / count
+    return mean, np.sqrt(np.maximum(mean_square - mean * mean, 0.0))
+
+def tile_stddev(frame, tile, step=4):
+    """
+    블록별 표준 편차를 step 픽셀 간격의 표본으로 빠르게 구합니다. (4K 에서 전체 픽셀의 1/16)
+    평탄한 블록인지 가리는 용도라 표본으로 충분합니다.
+    tile 이 step 으로 나누어떨어지지 않으면 전체 픽셀을 씁니다.
+
+    Returns:
+        np.ndarray: (행 블록 수, 열 블록 수) 크기의 표준 편차.
+    """
+    if tile % step:
+        step = 1
+    height, width = frame.shape[0] // tile * tile, frame.shape[1] // tile * tile
+    return tile_stats(np.ascontiguousarray(frame[:height:step, :width:step]), tile // step)[1]
+
+def detect_tile_glitch(prev_frame, current_frame, tile=64, threshold=25, min_tile_change=0.5,
+                       outlier_factor=4.0, max_tile_percent=10.0, flat_stddev=2.0, prev_std=None,
+                       current_std=None):
+    """
+    화면을 tile x tile 블록으로 나누어 국소적인 화면 깨짐(매크로블록, 고정된 줄무늬)을 찾습니다.
+
+    전체 변화율 하나로 판단하면 4K 화면의 64x64 블록 하나는 0.1% 도 되지 않아 놓치고,
+    정상적인 장면 전환은 오검출됩니다. 블록별 변화율을 구한 뒤 다른 블록보다 유독 많이 바뀐
+    블록만 골라내고, 대부분의 블록이 함께 바뀐 경우(장면 전환)는 깨짐으로 보지 않습니다.
+    무늬가 있던 블록이 한 가지 값으로 채워진 경우(표준 편차가 0 에 가까운 평탄/고정 블록)는
+    바뀐 픽셀이 적어도 깨짐으로 봅니다. 블록 통계는 Python 반복문 없이 reshape 로 한 번에 계산합니다.
+
+    Args:
+        prev_frame (np.array): 이전 프레임 이미지 (흑백).
+        current_frame (np.array): 현재 프레임 이미지 (흑백).
+        tile (int): 블록 한 변의 크기 (픽셀). 가장자리의 남는 픽셀은 검사하지 않습니다.
+        threshold (int): 두 프레임의 픽셀값 차이를 판단하는 임계값 (0-255).
+        min_tile_change (float): 깨짐으로 보는 블록 내 변화 픽셀 비율의 최소값 (0-1).
+        outlier_factor (float): 블록 변화율의 중앙값 + outlier_factor * MAD 를 넘어야 이상 블록으로 봅니다.
+        max_tile_percent (float): min_tile_change 보다 많이 바뀐 블록이 전체 블록의 이 비율(%)을 넘으면
+                                  장면 전환이나 화면 전체의 노이즈로 보고 무시합니다.
+        flat_stddev (float): 블록 표준 편차가 이 값보다 작으면 평탄한 블록으로 봅니다. 이전 프레임에서
+                             이 값의 4배 이상이던 블록이 평탄해지면 이상 블록입니다.
+        prev_std (np.ndarray): 이전 프레임의 tile_stddev(). 연속 프레임을 검사할 때 직전 호출의
+                               current_std 를 넘기면 다시 계산하지 않습니다. None 이면 계산합니다.
+        current_std (np.ndarray): 현재 프레임의 tile_stddev(). None 이면 계산합니다.
+
+    Returns:
+        list: 깨진 블록의 {"x", "y", "w", "h", "change_ratio", "stddev"} 목록. 없으면 빈 목록.
+    """
+    if prev_frame is None:
+        return []
+
+    rows, cols = current_frame.shape[0] // tile, current_frame.shape[1] // tile
+    if rows == 0 or cols == 0:
+        return []
+    height, width = rows * tile, cols * tile
+
+    # 변화 픽셀을 0/1 로 만든 뒤 (rows, tile, cols, tile) 로 바꿔 블록별 합계를 구함
+    diff_image = cv2.absdiff(prev_frame[:height, :width], current_frame[:height, :width])
+    _, changed = cv2.threshold(diff_image, threshold, 1, cv2.THRESH_BINARY)
+    tile_change = changed.reshape(rows, tile, cols, tile).sum(axis=(1, 3), dtype=np.uint32) / (tile * tile)
+
+    # 많이 바뀐 블록이 max_tile_percent 를 넘으면 장면 전환이나 화면 전체의 노이즈로 보고 무시
+    # (전체 노이즈에서는 블록 변화율이 중앙값 근처에 흩어져 있어 MAD 기준만으로는 일부 블록이 튐)
+    changed_tiles = tile_change > min_tile_change
+    if np.count_nonzero(changed_tiles) * 100 > max_tile_percent * tile_change.size:
+        return []
+    median = np.median(tile_change)
+    mad = np.median(np.abs(tile_change - median))
+
+    # 블록별 표준 편차 (모든 블록을 한 번에). 무늬가 사라지고 평탄해진 블록을 찾는 데 씀
+    if prev_std is None:
+        prev_std = tile_stddev(prev_frame, tile)
+    if current_std is None:
+        current_std = tile_stddev(current_frame, tile)
+    became_flat = (current_std < flat_stddev) & (prev_std >= 4 * flat_stddev)
+    outliers = (changed_tiles & (tile_change > median + outlier_factor * mad)) | became_flat
+    count = np.count_nonzero(outliers)
+    # 화면 전체가 평탄해진 경우(블랙 화면으로 전환 등)도 장면 전환으로 봄
+    if count == 0 or count * 100 > max_tile_percent * tile_change.size:
+        return []
+
+    return [{"x": int(col * tile), "y": int(row * tile), "w": tile, "h": tile,
+             "change_ratio": float(tile_change[row, col]), "stddev": float(current_std[row, col])}
+            for row, col in zip(*np.nonzero(outliers))]
+
+def checkSignal(videoFile, preview_every=1, sink=None, profiler=None, threshold=25, min_change_percent=0.1):
+    # preview_every: N 프레임마다 화면 표시, 0 이면 창 없이 디코딩 속도로 실행 (헤드리스)
+    # sink: cam_events 의 EventSink. 지정하면 print 대신 이벤트로 기록
+    # profiler: cam_profile.StageProfiler. 지정하면 단계별 처리 시간을 기록
+    # threshold, min_change_percent: 화면 깨짐 기준 (detect_screen_glitch 와 같음). sink 유무와 관계없이 적용
+    profiler = profiler or NULL_PROFILER
 
     # 비디오 캡처 객체 생성 (0은 기본 웹캠)
 #    cap = cv2.VideoCapture(0)
-    cap = cv2.VideoCapture(videoFile)
+    # videoFile 은 동영상 경로 또는 FrameStore 같은 프레임 소스
+    cap = open_source(videoFile, gray=True)
 
     # 첫 번째 프레임 초기화
     ret, prev_frame = cap.read()
     if ret:
-        prev_frame = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY) # 흑백 변환
+        prev_frame = to_gray(prev_frame) # 흑백 변환 (흑백으로 디코딩된 경우 그대로)
 
     count =0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
     while True:
+        profiler.lap("loop")
         ret, frame = cap.read()
+        profiler.lap("decode")
         if not ret:
             break
             
         # 현재 프레임을 흑백으로 변환
-        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray_frame = to_gray(frame)
+        profiler.lap("cvtColor")
 
         # 화면 깨짐 감지 함수 호출
-        glitch_detected = detect_screen_glitch(prev_frame, gray_frame)
-        if(glitch_detected !=None):
-            print("count :",count,"-",glitch_detected)
+        if sink is not None:
+            # count 는 두 번째 프레임부터 0 이므로 프레임 번호는 count + 1
+            change_rate = pixel_change_rate(prev_frame, gray_frame, threshold)
+            if change_rate > min_change_percent:
+                sink.emit(make_event(count + 1, "glitch", "change_percent", change_rate,
+                                     file=str(getattr(videoFile, "path", videoFile)),
+                                     timestamp=(count + 1) / fps if fps else None))
+        else:
+            glitch_detected = detect_screen_glitch(prev_frame, gray_frame, threshold, min_change_percent)
+            if(glitch_detected !=None):
+                print("count :",count,"-",glitch_detected)
+        profiler.lap("glitch")
 
         # 이전 프레임 업데이트
         prev_frame = gray_frame.copy()
 
         # 화면에 현재 프레임 표시
-        cv2.imshow("Original Frame", frame)
-
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        stop = show_preview("Original Frame", frame, count, preview_every)
+        profiler.lap("preview")
+        if stop:
             break
         count +=1
 
     cap.release()
-    cv2.destroyAllWindows()
+    close_preview(preview_every)
     
 def checkFoloder():
     # 현재 실행 파일의 경로
@@ -96,6 +235,6 @@ if __name__ == "__main__":
     video_file = "input.mp4"  # 처리할 동영상 파일명
     output_folder = "output"  # 이미지를 저장할 폴더명
     foler = checkFoloder()
-    video_file = foler +"\input.mp4"
-    output_folder =foler +"\output"
+    video_file = os.path.join(foler, "input.mp4")
+    output_folder =os.path.join(foler, "output")
     checkSignal(video_file)    
\ No newline at end of file
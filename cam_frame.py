@@ -0,0 +1,38 @@
+import cv2
+
+
+def to_gray(frame):
+    # 이미 흑백(Y 평면)으로 디코딩된 프레임이면 변환하지 않음
+    if frame.ndim == 2:
+        return frame
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def reduce_frame(frame, roi=None, analysis_width=None, gray=True):
+    """
+    통계 계산 전에 프레임을 관심 영역(ROI)으로 자르고 분석 해상도로 줄입니다.
+
+    밝기 평균/표준 편차 같은 대략적인 통계는 4K 원본이 아니어도 같은 판단이 나오므로
+    줄인 프레임으로 계산하면 프레임당 메모리 사용량이 크게 줄어듭니다.
+
+    Args:
+        frame (np.array): 원본 BGR 프레임 또는 흑백으로 디코딩된 프레임.
+        roi (tuple): 원본 좌표 기준 (x, y, w, h). None 이면 전체 화면.
+        analysis_width (int): 분석 해상도의 가로 폭. None 이거나 프레임보다 크면 줄이지 않습니다.
+        gray (bool): True 이면 흑백으로 변환해서 반환합니다.
+
+    Returns:
+        np.array: 줄인 프레임 (gray=True 이면 흑백).
+    """
+    if roi is not None:
+        # 슬라이싱은 복사 없이 원본의 일부를 가리키는 뷰
+        x, y, w, h = roi
+        frame = frame[y:y + h, x:x + w]
+
+    if analysis_width and frame.shape[1] > analysis_width:
+        height = max(1, round(frame.shape[0] * analysis_width / frame.shape[1]))
+        frame = cv2.resize(frame, (analysis_width, height), interpolation=cv2.INTER_AREA)
+
+    if gray:
+        return to_gray(frame)
+    return frame
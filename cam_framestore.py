@@ -0,0 +1,154 @@
+import cv2
+import json
+import numpy as np
+import os
+import sys
+
+from cam_source import seek_frame
+
+
+def index_path(store_path):
+    # 프레임 저장소의 형상/자료형/타임스탬프 정보 파일
+    return store_path + ".json"
+
+
+def build_frame_store(video_path, store_path, start_frame=0, end_frame=None):
+    """
+    동영상(또는 일부 구간)을 한 번 디코딩해서 원본 프레임을 하나의 파일에 이어서 저장합니다.
+    이후 FrameStore 로 열면 재디코딩 없이 아무 프레임이나 바로 읽을 수 있습니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        store_path (str): 저장할 프레임 파일 경로. 인덱스는 store_path + ".json" 에 저장됩니다.
+        start_frame (int): 저장을 시작할 프레임 번호
+        end_frame (int): 저장을 끝낼 프레임 번호 (포함하지 않음). None 이면 끝까지
+
+    Returns:
+        int: 저장한 프레임 수. 파일을 열 수 없으면 0.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Error: Could not open video file {video_path}")
+        return 0
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if start_frame > 0 and not seek_frame(cap, start_frame):
+        cap.release()
+        return 0
+
+    shape = None
+    dtype = None
+    timestamps = []
+    index = start_frame
+    with open(store_path, "wb") as f:
+        while end_frame is None or index < end_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if shape is None:
+                shape, dtype = frame.shape, frame.dtype
+            elif frame.shape != shape:
+                print(f"Error: frame {index} has shape {frame.shape}, expected {shape}")
+                break
+            f.write(frame.tobytes())
+            timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+            index += 1
+    cap.release()
+
+    index_data = {
+        "source": os.path.abspath(video_path),
+        "start_frame": start_frame,
+        "count": len(timestamps),
+        "shape": list(shape) if shape is not None else [],
+        "dtype": str(dtype) if dtype is not None else "uint8",
+        "fps": fps,
+        "timestamps": timestamps,
+    }
+    with open(index_path(store_path), "w", encoding="utf-8") as f:
+        json.dump(index_data, f)
+    return len(timestamps)
+
+
+class FrameStore:
+    """
+    build_frame_store 로 만든 프레임 저장소를 메모리 맵으로 엽니다.
+
+    store[i] 는 복사 없이 i 번째 프레임을 가리키는 읽기 전용 배열입니다.
+    cv2.VideoCapture 와 같은 read()/grab()/set()/get()/isOpened()/release() 도 제공하므로
+    checkSignal, assessment, extract_frames 에 동영상 경로 대신 넘길 수 있습니다.
+    프레임 번호는 저장을 시작한 프레임을 0 으로 하는 저장소 기준 번호입니다.
+    """
+
+    def __init__(self, store_path):
+        with open(index_path(store_path), "r", encoding="utf-8") as f:
+            self.index = json.load(f)
+        self.path = store_path
+        self.count = self.index["count"]
+        self.fps = self.index["fps"]
+        self.timestamps = self.index["timestamps"]
+        self.frames = None
+        if self.count:
+            self.frames = np.memmap(store_path, dtype=np.dtype(self.index["dtype"]), mode="r",
+                                    shape=(self.count, *self.index["shape"]))
+        self.pos = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def timestamp(self, index):
+        # index 번 프레임의 원본 동영상 기준 시각 (ms)
+        return self.timestamps[index]
+
+    def read(self, image=None):
+        if self.pos >= self.count:
+            return False, None
+        frame = self.frames[self.pos]
+        self.pos += 1
+        return True, frame
+
+    def grab(self):
+        if self.pos >= self.count:
+            return False
+        self.pos += 1
+        return True
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self.pos = min(max(int(value), 0), self.count)
+            return True
+        return False
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.count)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            return float(self.timestamps[self.pos - 1]) if self.pos else 0.0
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH and self.count:
+            return float(self.frames.shape[2])
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT and self.count:
+            return float(self.frames.shape[1])
+        return 0.0
+
+    def isOpened(self):
+        return self.frames is not None
+
+    def release(self):
+        # 저장소는 여러 번 재사용할 수 있으므로 위치만 처음으로 되돌림
+        self.pos = 0
+
+
+# 사용 예제
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    store_file = os.path.splitext(video_file)[0] + ".frames"
+    print("target file:", video_file)
+    count = build_frame_store(video_file, store_file)
+    print(f"stored {count} frames to {store_file}")
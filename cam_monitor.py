@@ -0,0 +1,169 @@
+import cv2
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+from cam_engine import default_detectors, process_frame
+
+
+def _is_live(source):
+    # 카메라 번호 또는 RTSP/HTTP 스트림 주소
+    return isinstance(source, int) or (isinstance(source, str) and "://" in source)
+
+
+class StreamMonitor:
+    """
+    카메라, RTSP 주소, 동영상 파일 또는 프레임 이터레이터를 계속 읽으면서 모든 검출기를 실행합니다.
+
+    캡처 스레드와 분석 루프는 크기가 고정된 큐로 연결됩니다.
+    실시간 소스에서는 분석이 밀리면 오래된 프레임을 버리고 최신 프레임을 분석하므로
+    실시간보다 뒤처지지 않습니다. 검출기는 이전 프레임/연속 프레임 수 같은 고정 크기 상태만 가지므로
+    며칠 동안 실행해도 메모리가 늘어나지 않습니다.
+
+    이벤트는 발생하는 즉시 on_event(event) 로 전달되며, event 에는 캡처 시각 "timestamp" 가 들어 있습니다.
+    파일로 기록하려면 on_event 에 cam_events 의 EventSink.emit 을 넘기면 됩니다.
+    """
+
+    def __init__(self, source, detectors=None, on_event=None, analysis_width=None,
+                 drop_frames=None, queue_size=1, reconnect_delay=1.0, max_recent_events=1000, live=None):
+        """
+        Args:
+            source: 카메라 번호(int), 스트림 주소, 동영상 파일 경로, read()가 있는 캡처 객체 또는 프레임 이터러블
+            detectors (list): FrameDetector 목록. None 이면 기본 검출기 4종.
+            on_event (callable): 이벤트마다 호출되는 함수.
+            analysis_width (int): 통계 계산에 쓰는 가로 폭. None 이면 원본 해상도.
+            drop_frames (bool): 분석이 밀리면 프레임을 버릴지 여부. None 이면 실시간 소스일 때만 버립니다.
+            queue_size (int): 캡처와 분석 사이 큐 크기.
+            reconnect_delay (float): 카메라/스트림이 끊겼을 때 다시 연결하기 전 대기 시간 (초).
+            max_recent_events (int): recent_events 에 보관하는 최근 이벤트 수.
+            live (bool): 실시간 소스인지 여부. None 이면 카메라 번호/스트림 주소일 때만 실시간으로 봅니다.
+                         캡처 객체를 직접 넘길 때 True 로 지정하면 읽기가 실패해도 다시 읽기를 시도하고,
+                         프레임 이터러블도 분석이 밀리면 오래된 프레임을 버립니다.
+        """
+        self.source = source
+        self.source_name = str(source) if isinstance(source, (int, str)) else None
+        self.detectors = detectors if detectors is not None else default_detectors()
+        self.on_event = on_event
+        self.analysis_width = analysis_width
+        self.live = _is_live(source) if live is None else live
+        self.drop_frames = self.live if drop_frames is None else drop_frames
+        self.reconnect_delay = reconnect_delay
+        self.frames = queue.Queue(maxsize=max(1, queue_size))
+        self.recent_events = deque(maxlen=max_recent_events)
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.running = False
+
+    def _read_frames(self):
+        source = self.source
+        if not isinstance(source, (int, str)) and not hasattr(source, "read"):
+            # 테스트용 프레임 생성기 등
+            for frame in source:
+                if not self.running:
+                    return
+                yield frame
+            return
+
+        while self.running:
+            cap = source if hasattr(source, "read") else cv2.VideoCapture(source)
+            while self.running:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame
+            if cap is not source:
+                cap.release()
+            if not self.live:
+                return
+            # 카메라/스트림이 끊기면 잠시 후 다시 연결 (캡처 객체는 같은 객체에서 다시 읽음)
+            time.sleep(self.reconnect_delay)
+
+    def _capture(self):
+        for frame in self._read_frames():
+            item = (self.frames_captured, time.time(), frame)
+            self.frames_captured += 1
+            if self.drop_frames:
+                # 큐가 차 있으면 가장 오래된 프레임을 버리고 최신 프레임을 넣음
+                while True:
+                    try:
+                        self.frames.put_nowait(item)
+                        break
+                    except queue.Full:
+                        try:
+                            self.frames.get_nowait()
+                            self.frames_dropped += 1
+                        except queue.Empty:
+                            pass
+            else:
+                while self.running:
+                    try:
+                        self.frames.put(item, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+            if not self.running:
+                break
+
+    def _emit(self, event):
+        self.recent_events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def run(self, max_frames=None):
+        """
+        소스가 끝나거나 stop()이 호출될 때까지 분석합니다.
+
+        Args:
+            max_frames (int): 이 수만큼 분석하면 멈춥니다. None 이면 제한 없음.
+        """
+        self.running = True
+        for detector in self.detectors:
+            detector.reset()
+
+        thread = threading.Thread(target=self._capture, daemon=True)
+        thread.start()
+        try:
+            while self.running:
+                try:
+                    index, timestamp, frame = self.frames.get(timeout=0.5)
+                except queue.Empty:
+                    if not thread.is_alive():
+                        break
+                    continue
+
+                for event in process_frame(index, frame, self.detectors, self.analysis_width):
+                    event["file"] = self.source_name
+                    event["timestamp"] = timestamp
+                    self._emit(event)
+                self.frames_processed += 1
+                if max_frames is not None and self.frames_processed >= max_frames:
+                    break
+        finally:
+            self.running = False
+            thread.join()
+
+    def stop(self):
+        # 다른 스레드에서 호출해 모니터링을 끝냄
+        self.running = False
+
+
+# 사용 예제
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "0"
+    if source.isdigit():
+        source = int(source)
+
+    def show_event(event):
+        stamp = time.strftime("%H:%M:%S", time.localtime(event["timestamp"]))
+        print(f"[{stamp}] {event['frame']}: {event['detector']} {event['metric']}={event['value']:.2f}")
+
+    monitor = StreamMonitor(source, on_event=show_event)
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        monitor.stop()
+    print(f"captured: {monitor.frames_captured}, processed: {monitor.frames_processed}, "
+          f"dropped: {monitor.frames_dropped}")
@@ -0,0 +1,138 @@
+import cv2
+import numpy as np
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from cam_capture import configure, open_capture
+from cam_frame import reduce_frame
+from cam_source import seek_frame
+from cam_stats import STATS_DTYPE, evaluate_stats, frame_stats
+
+# 구간 하나의 최소 길이. 너무 짧으면 탐색(seek) 비용이 분석 비용보다 커짐
+MIN_SEGMENT_FRAMES = 300
+
+
+def _init_worker():
+    # 프로세스마다 OpenCV 내부 스레드를 쓰면 코어 수보다 스레드가 많아지므로 1개로 제한
+    cv2.setNumThreads(1)
+    # 디코더도 구간마다 따로 돌기 때문에 프로세스당 디코더 스레드 1개
+    configure(threads=1)
+
+
+def _segment_stats(video_path, start, end, black_level, diff_threshold, analysis_width=None, roi=None):
+    """
+    [start, end) 구간의 프레임 통계를 계산합니다. end 가 None 이면 파일 끝까지 읽습니다.
+
+    구간 경계에서도 순차 실행과 같은 결과가 나오도록
+    start - 1 번 프레임을 먼저 디코딩해서 이전 프레임으로 사용합니다.
+    """
+    cap = open_capture(video_path, gray=True)
+    rows = []
+    try:
+        prev_gray = None
+        first = max(start - 1, 0)
+        if not seek_frame(cap, first):
+            return np.array(rows, dtype=STATS_DTYPE)
+
+        if start > 0:
+            ret, frame = cap.read()
+            if not ret:
+                return np.array(rows, dtype=STATS_DTYPE)
+            prev_gray = reduce_frame(frame, roi, analysis_width)
+
+        index = start
+        while end is None or index < end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            gray = reduce_frame(frame, roi, analysis_width)
+            rows.append(frame_stats(gray, prev_gray, black_level, diff_threshold))
+            prev_gray = gray
+            index += 1
+    finally:
+        cap.release()
+    return np.array(rows, dtype=STATS_DTYPE)
+
+
+def split_segments(frame_count, segments):
+    """
+    프레임 수를 segments 개의 [start, end) 구간으로 나눕니다.
+    프레임 수 정보가 부정확할 수 있으므로 마지막 구간은 end=None (파일 끝까지) 입니다.
+    """
+    segments = max(1, min(segments, frame_count // MIN_SEGMENT_FRAMES))
+    bounds = np.linspace(0, frame_count, segments + 1).astype(int).tolist()
+    result = [(bounds[i], bounds[i + 1]) for i in range(segments)]
+    result[-1] = (result[-1][0], None)
+    return result
+
+
+def compute_frame_stats_parallel(video_path, workers=None, black_level=10, diff_threshold=25,
+                                 analysis_width=None, roi=None):
+    """
+    동영상을 구간으로 나누어 프로세스 풀에서 통계를 계산한 뒤 이어 붙입니다.
+    결과는 cam_stats.compute_frame_stats 와 같습니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        workers (int): 프로세스 수. None 이면 CPU 코어 수.
+        black_level (int): 검은 픽셀 판단 기준 밝기.
+        diff_threshold (int): 픽셀 변화 판단 기준 (0-255).
+        analysis_width (int): 통계 계산에 쓰는 가로 폭. None 이면 원본 해상도.
+        roi (tuple): 관심 영역 (x, y, w, h). None 이면 전체 화면.
+
+    Returns:
+        np.ndarray: STATS_DTYPE 구조체 배열. 파일을 열 수 없으면 None.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"Error: Could not open video file {video_path}")
+        return None
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    workers = workers or os.cpu_count() or 1
+    # 구간 길이 편차로 생기는 대기 시간을 줄이기 위해 작업자 수보다 구간을 잘게 나눔
+    segments = split_segments(frame_count, workers * 4)
+    if len(segments) == 1:
+        return _segment_stats(video_path, 0, None, black_level, diff_threshold, analysis_width, roi)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_segment_stats, video_path, start, end, black_level, diff_threshold,
+                               analysis_width, roi)
+                   for start, end in segments]
+        parts = [future.result() for future in futures]
+    return np.concatenate(parts)
+
+
+def analyze_video_parallel(video_path, workers=None, **thresholds):
+    """
+    구간 병렬로 통계를 계산하고 임계값을 적용해 cam_engine.analyze_video 와 같은 형태의 보고서를 만듭니다.
+    깜빡임의 이전 밝기, 화면 깨짐의 이전 프레임, 구간 경계를 넘는 블랙 구간은
+    이어 붙인 전체 통계 배열에서 판단하므로 순차 실행과 결과가 같습니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        workers (int): 프로세스 수. None 이면 CPU 코어 수.
+        **thresholds: cam_stats.evaluate_stats 에 넘길 임계값.
+
+    Returns:
+        dict: {"file", "frame_count", "events"} 형태의 보고서. 파일을 열 수 없으면 None.
+    """
+    stats = compute_frame_stats_parallel(video_path, workers)
+    if stats is None:
+        return None
+    return {"file": video_path, "frame_count": len(stats), "events": evaluate_stats(stats, **thresholds)}
+
+
+# 사용 예제
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    print("target file:", video_file)
+    report = analyze_video_parallel(video_file)
+    if report is not None:
+        for frame_index, frame_events in report["events"].items():
+            for event in frame_events:
+                print(f"{frame_index}: {event['detector']} {event['metric']}={event['value']:.2f}")
+        print(f"total frames: {report['frame_count']}")
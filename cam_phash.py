@@ -0,0 +1,170 @@
+import cv2
+import numpy as np
+import os
+import sys
+
+# 바이트 값별 1 비트 개수 (numpy 에 bitwise_count 가 없을 때 사용)
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# 해시 하나의 비트 수
+HASH_BITS = 64
+# 9x8 로 줄이기 전에 간격을 두고 픽셀을 골라 이 폭 근처까지 먼저 줄임
+HASH_PRESCALE_WIDTH = 960
+
+
+def dhash(gray):
+    """
+    흑백 프레임의 64비트 차이 해시(dHash)를 계산합니다.
+
+    프레임을 9x8 로 줄인 뒤 가로로 이웃한 픽셀의 밝기 대소를 비트로 씁니다.
+    압축 잡음이나 약한 밝기 변화에는 거의 바뀌지 않고, 화면 내용이 바뀌면 여러 비트가 바뀝니다.
+    원본 해상도에서 바로 INTER_AREA 로 9x8 까지 줄이면 모든 픽셀을 읽어야 해서 4K 에서 수십 ms 가
+    걸리므로, 먼저 정수 간격으로 픽셀을 골라 HASH_PRESCALE_WIDTH 근처로 줄인 뒤 9x8 로 줄입니다.
+    9x8 칸 하나가 수백 픽셀의 평균이라 간격을 둔 표본으로도 해시는 거의 같습니다.
+
+    Args:
+        gray (np.array): 흑백 프레임.
+
+    Returns:
+        int: 64비트 해시 (np.uint64 로 저장할 수 있는 값).
+    """
+    step = gray.shape[1] // HASH_PRESCALE_WIDTH
+    if step > 1:
+        gray = np.ascontiguousarray(gray[::step, ::step])
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming_distance(hashes, target):
+    """
+    해시 배열과 해시 하나(또는 같은 길이의 배열) 사이의 해밍 거리를 계산합니다.
+
+    Args:
+        hashes (np.ndarray): uint64 해시 배열.
+        target (int | np.ndarray): 비교할 해시.
+
+    Returns:
+        np.ndarray: 원소별로 다른 비트 수 (uint8).
+    """
+    xor = np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), np.asarray(target, dtype=np.uint64))
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor)
+    xor = np.ascontiguousarray(xor)
+    return POPCOUNT_TABLE[xor.view(np.uint8)].reshape(xor.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def freeze_runs(hashes, max_distance=2, min_frames=30):
+    """
+    이웃한 프레임의 해시가 거의 같은(정지 화면) 연속 구간을 찾습니다.
+
+    화면 전체가 한 가지 밝기인 프레임(블랙화면 등)도 해시가 같으므로 정지 구간으로 잡힙니다.
+    블랙화면과 구분하려면 cam_stats 의 평균 밝기와 함께 보면 됩니다.
+
+    Args:
+        hashes (np.ndarray): 프레임 순서의 uint64 해시 배열.
+        max_distance (int): 이 값 이하로 다르면 같은 프레임으로 봅니다.
+        min_frames (int): 정지 구간으로 보고할 최소 프레임 수.
+
+    Returns:
+        tuple: (starts, ends) 배열. 각 구간은 [start, end) 프레임 범위입니다.
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    if len(hashes) < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    # same[i] 는 i+1 번 프레임이 i 번 프레임과 같은지
+    same = (hamming_distance(hashes[1:], hashes[:-1]) <= max_distance).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], same, [0])))
+    starts = np.nonzero(edges == 1)[0]
+    ends = np.nonzero(edges == -1)[0] + 1
+    long_enough = (ends - starts) >= min_frames
+    return starts[long_enough], ends[long_enough]
+
+
+class HashIndex:
+    """
+    여러 동영상의 프레임 해시를 모아 두고 비슷한 프레임을 찾는 색인입니다.
+
+    해시는 하나의 uint64 배열에 이어서 저장하고, 검색은 전체 배열에 대한 벡터화된
+    해밍 거리 계산으로 합니다. (수백만 프레임까지 검색 한 번에 수십 ms)
+    add()는 동영상별 배열을 목록에 모아 두기만 하고, 검색/저장할 때 한 번만 이어 붙입니다.
+    (add 마다 전체 배열을 복사하면 색인을 만드는 시간이 동영상 수의 제곱으로 늘어남)
+    """
+
+    def __init__(self):
+        self.files = []
+        self.offsets = [0]
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._pending = []
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    @property
+    def hashes(self):
+        # 전체 동영상의 해시를 이은 배열. 새로 추가된 것이 있을 때만 이어 붙임
+        if self._pending:
+            self._hashes = np.concatenate([self._hashes] + self._pending)
+            self._pending = []
+        return self._hashes
+
+    def add(self, file, hashes):
+        """
+        동영상 하나의 프레임 해시를 추가합니다.
+
+        Args:
+            file (str): 동영상 경로 (검색 결과에 표시할 이름).
+            hashes (np.ndarray): 프레임 순서의 uint64 해시 배열 (예: stats["dhash"]).
+        """
+        # 호출한 쪽이 배열을 나중에 바꿔도 색인이 바뀌지 않도록 복사해서 보관
+        hashes = np.array(hashes, dtype=np.uint64)
+        self.files.append(file)
+        self._pending.append(hashes)
+        self.offsets.append(self.offsets[-1] + len(hashes))
+
+    def locate(self, position):
+        # 전체 배열 위치를 (동영상 경로, 프레임 번호)로 변환
+        file_index = int(np.searchsorted(self.offsets, position, side="right")) - 1
+        return self.files[file_index], int(position - self.offsets[file_index])
+
+    def search(self, target, max_distance=4, limit=None):
+        """
+        target 과 해밍 거리가 max_distance 이하인 프레임을 가까운 순서로 찾습니다.
+
+        Returns:
+            list: (동영상 경로, 프레임 번호, 거리) 목록.
+        """
+        distances = hamming_distance(self.hashes, target)
+        positions = np.nonzero(distances <= max_distance)[0]
+        positions = positions[np.argsort(distances[positions], kind="stable")]
+        if limit is not None:
+            positions = positions[:limit]
+        return [(*self.locate(position), int(distances[position])) for position in positions]
+
+    def save(self, path):
+        np.savez(path, hashes=self.hashes, offsets=np.array(self.offsets, dtype=np.int64),
+                 files=np.array(self.files, dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls()
+        index._hashes = data["hashes"]
+        index.offsets = data["offsets"].tolist()
+        index.files = data["files"].tolist()
+        return index
+
+
+# 사용 예제
+if __name__ == "__main__":
+    from cam_cache import load_or_compute_stats
+
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    print("target file:", video_file)
+    stats = load_or_compute_stats(video_file)
+    if stats is not None:
+        starts, ends = freeze_runs(stats["dhash"])
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            print(f"frozen: frames {start}-{end - 1}")
@@ -0,0 +1,27 @@
+import cv2
+
+
+def show_preview(window_name, frame, index, preview_every=1, wait_ms=1):
+    """
+    preview_every 프레임마다 한 번씩만 프레임을 화면에 표시합니다.
+
+    Args:
+        window_name (str): 표시할 창 이름.
+        frame (np.array): 표시할 프레임.
+        index (int): 프레임 번호.
+        preview_every (int): 표시 간격. 0 이면 창을 만들지 않는 헤드리스 모드입니다.
+        wait_ms (int): 표시 후 키 입력을 기다리는 시간 (ms).
+
+    Returns:
+        bool: 사용자가 'q'를 눌러 중단을 요청했으면 True.
+    """
+    if not preview_every or index % preview_every:
+        return False
+    cv2.imshow(window_name, frame)
+    return cv2.waitKey(wait_ms) & 0xFF == ord('q')
+
+
+def close_preview(preview_every):
+    # 헤드리스 빌드의 OpenCV 는 destroyAllWindows 를 지원하지 않으므로 창을 띄운 경우에만 호출
+    if preview_every:
+        cv2.destroyAllWindows()
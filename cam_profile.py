@@ -0,0 +1,94 @@
+import json
+import time
+
+# 히스토그램 구간 수: 구간 i 는 [2^(i-1), 2^i) 마이크로초
+HISTOGRAM_BUCKETS = 32
+
+
+class StageProfiler:
+    """
+    프레임 루프의 단계별(디코딩, 흑백 변환, 블러, 윤곽선 등) 누적 시간과 분포를 기록합니다.
+
+    사용법: 각 단계가 끝날 때마다 lap("단계 이름")을 호출하면 직전 lap 이후 걸린 시간이
+    그 단계에 더해집니다. 루프 맨 앞에서 lap("loop")을 호출하면 단계 사이의
+    Python 루프 오버헤드(출력, 미리보기 등)가 "loop" 로 집계됩니다.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.histograms = {}
+        self.last = None
+        self.first = None
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        last = self.last
+        self.last = now
+        if last is None:
+            self.first = now
+            return
+        elapsed = now - last
+        if stage not in self.totals:
+            self.totals[stage] = 0.0
+            self.counts[stage] = 0
+            self.histograms[stage] = [0] * HISTOGRAM_BUCKETS
+        self.totals[stage] += elapsed
+        self.counts[stage] += 1
+        bucket = min(int(elapsed * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.histograms[stage][bucket] += 1
+
+    def _percentile_ms(self, stage, percent):
+        # 히스토그램 구간의 상한값으로 근사
+        target = self.counts[stage] * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.histograms[stage]):
+            seen += count
+            if seen >= target:
+                return (1 << bucket) / 1000
+        return (1 << (HISTOGRAM_BUCKETS - 1)) / 1000
+
+    def to_dict(self):
+        wall = (self.last - self.first) if self.first is not None else 0.0
+        stages = {}
+        for stage, total in self.totals.items():
+            stages[stage] = {
+                "calls": self.counts[stage],
+                "total_s": total,
+                "mean_ms": total * 1000 / self.counts[stage],
+                "p50_ms": self._percentile_ms(stage, 50),
+                "p99_ms": self._percentile_ms(stage, 99),
+                "histogram_us_log2": self.histograms[stage],
+            }
+        return {"wall_s": wall, "stages": stages}
+
+    def summary(self):
+        """단계별 집계 표를 문자열로 반환합니다."""
+        data = self.to_dict()
+        wall = data["wall_s"] or 1e-9
+        lines = [f"{'stage':16} {'calls':>8} {'total s':>9} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'%':>6}"]
+        for stage, s in sorted(data["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{stage:16} {s['calls']:8d} {s['total_s']:9.3f} {s['mean_ms']:9.3f} "
+                         f"{s['p50_ms']:8.3f} {s['p99_ms']:8.3f} {s['total_s'] * 100 / wall:6.1f}")
+        lines.append(f"{'wall':16} {'':8} {data['wall_s']:9.3f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        # 분석용 JSON 파일로 저장
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, path=None):
+        print(self.summary())
+        if path:
+            self.dump(path)
+
+
+class NullProfiler:
+    """프로파일링을 끈 경우에 쓰는 아무 일도 하지 않는 프로파일러."""
+
+    def lap(self, stage):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
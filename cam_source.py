@@ -0,0 +1,127 @@
+import cv2
+import queue
+import threading
+
+from cam_capture import open_capture
+
+
+def seek_frame(cap, index):
+    """
+    cv2.VideoCapture 를 index 번 프레임을 다음에 읽을 위치로 이동합니다.
+    탐색 결과 위치가 맞지 않는 코덱이면 처음부터 grab()으로 건너뜁니다.
+
+    Returns:
+        bool: 이동에 성공했으면 True (파일이 그보다 짧으면 False).
+    """
+    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == index:
+        return True
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for _ in range(index):
+        if not cap.grab():
+            return False
+    return True
+
+
+def open_source(source, gray=False):
+    """
+    동영상 경로면 FrameSource 로 열고, 이미 read()를 가진 프레임 소스(FrameStore 등)는 그대로 돌려줍니다.
+    """
+    if hasattr(source, "read"):
+        return source
+    return FrameSource(source, gray=gray)
+
+
+class FrameSource:
+    """
+    백그라운드 스레드에서 미리 디코딩해 두는 프레임 소스입니다.
+
+    cv2.VideoCapture 와 같은 read()/isOpened()/get()/release() 인터페이스를 제공하므로
+    기존 검출 루프에서 cv2.VideoCapture 대신 그대로 쓸 수 있습니다.
+    OpenCV 는 디코딩 중에 GIL 을 놓기 때문에 디코딩과 분석이 겹쳐서 실행됩니다.
+
+    프레임은 미리 할당한 버퍼 buffers 개를 돌려 쓰므로,
+    read()가 돌려준 프레임은 다음 read() 호출 전까지만 유효합니다.
+    더 오래 보관하려면 복사해야 합니다.
+
+    백엔드/디코더 스레드는 cam_capture.open_capture 설정을 따르며,
+    gray=True 이면 백엔드가 지원할 때 흑백(Y 평면) 프레임을 받습니다.
+    """
+
+    def __init__(self, video_path, buffers=8, gray=False, backend=None, threads=None):
+        self.cap = open_capture(video_path, backend, threads, gray)
+        self.buffers = [None] * buffers
+        self.free_slots = queue.Queue()
+        self.ready_slots = queue.Queue()
+        for slot in range(buffers):
+            self.free_slots.put(slot)
+        self.current_slot = None
+        self.finished = False
+        self.stopped = False
+        self.thread = None
+        if self.cap.isOpened():
+            self.thread = threading.Thread(target=self._decode, daemon=True)
+            self.thread.start()
+        else:
+            self.finished = True
+
+    def _decode(self):
+        try:
+            while not self.stopped:
+                slot = self.free_slots.get()
+                if slot is None:
+                    break
+                # 같은 크기의 버퍼를 넘기면 OpenCV 가 새로 할당하지 않고 그 버퍼에 디코딩함
+                ret, frame = self.cap.read(self.buffers[slot])
+                if not ret:
+                    break
+                self.buffers[slot] = frame
+                self.ready_slots.put(slot)
+        finally:
+            # 소비 쪽에 스트림 끝을 알림
+            self.ready_slots.put(None)
+
+    def read(self):
+        # 이전에 돌려준 버퍼를 디코딩 스레드가 다시 쓸 수 있도록 반납
+        if self.current_slot is not None:
+            self.free_slots.put(self.current_slot)
+            self.current_slot = None
+        if self.finished:
+            return False, None
+
+        slot = self.ready_slots.get()
+        if slot is None:
+            self.finished = True
+            return False, None
+        self.current_slot = slot
+        return True, self.buffers[slot]
+
+    def isOpened(self):
+        return self.cap.isOpened() and not self.finished
+
+    def get(self, prop_id):
+        # 위치 관련 값(CAP_PROP_POS_FRAMES 등)은 미리 디코딩한 만큼 앞서 있음
+        return self.cap.get(prop_id)
+
+    def release(self):
+        self.stopped = True
+        if self.thread is not None:
+            self.free_slots.put(None)
+            self.thread.join()
+            self.thread = None
+        self.finished = True
+        self.cap.release()
+
+    def __iter__(self):
+        while True:
+            ret, frame = self.read()
+            if not ret:
+                break
+            yield frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
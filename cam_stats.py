@@ -0,0 +1,177 @@
+import cv2
+import numpy as np
+import os
+import sys
+
+from cam_engine import FrameDetector, analyze_video, make_event
+from cam_findBroken import pixel_change_rate
+from cam_phash import dhash, freeze_runs
+
+# 프레임당 한 행씩 저장되는 통계값
+# mean: 평균 밝기, std: 밝기 표준 편차,
+# black_ratio: 어두운 픽셀 비율 (0-1), change_ratio: 이전 프레임 대비 변화된 픽셀 비율 (0-1),
+# dhash: 64비트 차이 해시 (cam_phash.dhash)
+STATS_DTYPE = np.dtype([
+    ("mean", np.float32),
+    ("std", np.float32),
+    ("black_ratio", np.float32),
+    ("change_ratio", np.float32),
+    ("dhash", np.uint64),
+])
+
+
+def frame_stats(gray, prev_gray, black_level=10, diff_threshold=25):
+    """
+    흑백 프레임 하나의 통계값을 계산합니다.
+
+    Args:
+        gray (np.array): 현재 프레임 (흑백).
+        prev_gray (np.array): 이전 프레임 (흑백). 첫 프레임이면 None.
+        black_level (int): 이 값보다 어두운 픽셀을 검은 픽셀로 봅니다.
+        diff_threshold (int): 픽셀 변화로 판단하는 밝기 차이 (0-255).
+
+    Returns:
+        tuple: STATS_DTYPE 순서의 (mean, std, black_ratio, change_ratio, dhash).
+    """
+    mean, std_dev = cv2.meanStdDev(gray)
+    black_ratio = np.count_nonzero(gray < black_level) / gray.size
+    change_ratio = 0.0
+    if prev_gray is not None:
+        change_ratio = pixel_change_rate(prev_gray, gray, diff_threshold) / 100
+    return (mean[0][0], std_dev[0][0], black_ratio, change_ratio, dhash(gray))
+
+
+class FrameStatsCollector(FrameDetector):
+    """
+    분석 엔진에서 다른 검출기와 같은 디코딩 패스로 프레임 통계를 모읍니다.
+    이벤트는 만들지 않고, 끝난 뒤 to_array()로 통계 배열을 꺼냅니다.
+    """
+    name = "stats"
+
+    def __init__(self, black_level=10, diff_threshold=25, roi=None):
+        self.black_level = black_level
+        self.diff_threshold = diff_threshold
+        self.roi = roi
+        self.reset()
+
+    def reset(self):
+        self.rows = []
+        self.prev_gray = None
+
+    def process(self, index, frame, gray):
+        self.rows.append(frame_stats(gray, self.prev_gray, self.black_level, self.diff_threshold))
+        self.prev_gray = gray
+        return []
+
+    def to_array(self):
+        return np.array(self.rows, dtype=STATS_DTYPE)
+
+
+def compute_frame_stats(video_path, black_level=10, diff_threshold=25, analysis_width=None, roi=None):
+    """
+    동영상을 한 번 디코딩하여 프레임별 통계 배열을 만듭니다.
+
+    Args:
+        video_path (str): 입력 동영상 파일의 경로
+        black_level (int): 검은 픽셀 판단 기준 밝기.
+        diff_threshold (int): 픽셀 변화 판단 기준 (0-255).
+        analysis_width (int): 통계 계산에 쓰는 가로 폭. None 이면 원본 해상도.
+        roi (tuple): 원본 좌표 기준 관심 영역 (x, y, w, h). None 이면 전체 화면.
+
+    Returns:
+        np.ndarray: STATS_DTYPE 구조체 배열 (프레임당 한 행). 파일을 열 수 없으면 None.
+    """
+    collector = FrameStatsCollector(black_level, diff_threshold, roi)
+    if analyze_video(video_path, [collector], analysis_width) is None:
+        return None
+    return collector.to_array()
+
+
+def black_runs(stats, threshold=10):
+    """
+    평균 밝기가 threshold 미만인 연속 구간을 찾습니다.
+
+    Returns:
+        tuple: (starts, ends) 배열. 각 구간은 [start, end) 프레임 범위입니다.
+    """
+    dark = (stats["mean"] < threshold).astype(np.int8)
+    # 앞뒤에 0을 붙여서 구간의 시작(+1)과 끝(-1)을 찾음
+    edges = np.diff(np.concatenate(([0], dark, [0])))
+    return np.nonzero(edges == 1)[0], np.nonzero(edges == -1)[0]
+
+
+def find_blinks(stats, blink_threshold=50.0):
+    # 이전 프레임 대비 평균 밝기 변화가 임계값을 넘는 프레임 (blink.detectBlink)
+    luminosity_diff = np.abs(np.diff(stats["mean"].astype(np.float64)))
+    return np.nonzero(luminosity_diff > blink_threshold)[0] + 1
+
+
+def find_black_screens(stats, threshold=10, duration_frames=10):
+    # 블랙 구간이 duration_frames 에 도달한 프레임 (cam_detectBlack.detect_black_screen)
+    starts, ends = black_runs(stats, threshold)
+    long_enough = (ends - starts) >= duration_frames
+    return starts[long_enough] + duration_frames - 1
+
+
+def find_noise(stats, black_level=10, noise_std=100):
+    # 화면 출력 없음 또는 노이즈로 판단되는 프레임 (cam_anomy.detect_screen_anomaly)
+    return np.nonzero((stats["mean"] < black_level) | (stats["std"] > noise_std))[0]
+
+
+def find_glitches(stats, min_change_percent=0.1):
+    # 픽셀 변화율이 기준을 넘는 프레임 (cam_findBroken.detect_screen_glitch)
+    return np.nonzero(stats["change_ratio"] * 100 > min_change_percent)[0]
+
+
+def find_freezes(stats, max_distance=2, min_frames=30):
+    # 정지 구간이 min_frames 에 도달한 프레임 (cam_engine.FreezeDetector)
+    starts, _ = freeze_runs(stats["dhash"], max_distance, min_frames)
+    return starts + min_frames - 1
+
+
+def evaluate_stats(stats, blink_threshold=50.0, black_threshold=10, duration_frames=10,
+                   black_level=10, noise_std=100, min_change_percent=0.1):
+    """
+    통계 배열에 임계값을 적용해서 analyze_video 와 같은 형태의 프레임별 이벤트를 만듭니다.
+    임계값만 바꿔서 다시 평가할 때는 동영상을 다시 디코딩할 필요가 없습니다.
+
+    Returns:
+        dict: 프레임 번호별 이벤트 목록.
+    """
+    mean = stats["mean"]
+    events = {}
+
+    def add(indices, detector, metric, values):
+        for index, value in zip(indices.tolist(), values.tolist()):
+            events.setdefault(index, []).append(make_event(index, detector, metric, value))
+
+    blinks = find_blinks(stats, blink_threshold)
+    add(blinks, "blink", "luminosity_diff", np.abs(mean[blinks] - mean[blinks - 1]))
+
+    blacks = find_black_screens(stats, black_threshold, duration_frames)
+    add(blacks, "black_screen", "mean_brightness", mean[blacks])
+
+    dark = np.nonzero(mean < black_level)[0]
+    noisy = np.nonzero((mean >= black_level) & (stats["std"] > noise_std))[0]
+    add(dark, "noise", "mean", mean[dark])
+    add(noisy, "noise", "stddev", stats["std"][noisy])
+
+    glitches = find_glitches(stats, min_change_percent)
+    add(glitches, "glitch", "change_percent", stats["change_ratio"][glitches] * 100)
+
+    return dict(sorted(events.items()))
+
+
+# 사용 예제
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    video_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(folder, "input.mp4")
+    print("target file:", video_file)
+    stats = compute_frame_stats(video_file)
+    if stats is not None:
+        print(f"frames: {len(stats)}")
+        print("blink:", find_blinks(stats).tolist())
+        print("black screen:", find_black_screens(stats).tolist())
+        print("noise:", find_noise(stats).tolist())
+        print("glitch:", find_glitches(stats).tolist())
+        print("freeze:", find_freezes(stats).tolist())
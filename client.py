@@ -1,9 +1,34 @@
 import sys
-import socket
 import os
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                               QLabel, QLineEdit, QPushButton, QListWidget, QFileDialog)
-from PySide6.QtCore import Slot
+                               QLabel, QLineEdit, QPushButton, QListWidget, QFileDialog, QProgressBar)
+from PySide6.QtCore import Signal, QThread, QObject, Slot
+
+from udp_transfer import send_file
+
+class FileSender(QObject):
+    # 보낸(수신 쪽이 확인한) 바이트, 전체 바이트, 초당 바이트, 남은 시간(초). 최대 10 Hz 로만 보냄
+    # 바이트 수는 2 GiB 를 넘을 수 있으므로 qint64 (Signal 의 int 는 32비트)
+    progress_updated = Signal("qint64", "qint64", float, float)
+    # 전송 완료 (파일 크기)
+    finished = Signal("qint64")
+    # 전송 실패 (사유)
+    failed = Signal(str)
+
+    def __init__(self, path, address):
+        super().__init__()
+        self.path = path
+        self.address = address
+
+    @Slot()
+    def run(self):
+        # 서버가 저장을 마칠 때까지 기다리는 동기 전송을 GUI 스레드 밖에서 실행
+        # 어떤 경우에도 finished 나 failed 중 하나는 GUI 로 전달되어야 버튼이 다시 켜짐
+        try:
+            size = send_file(self.path, self.address, on_progress=self.progress_updated.emit)
+            self.finished.emit(size)
+        except Exception as e:
+            self.failed.emit(str(e))
 
 class ClientGUI(QMainWindow):
     def __init__(self):
@@ -43,6 +68,12 @@ class ClientGUI(QMainWindow):
         self.send_button.setEnabled(False)
         self.layout.addWidget(self.send_button)
 
+        self.progress_label = QLabel("")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.layout.addWidget(self.progress_label)
+        self.layout.addWidget(self.progress_bar)
+
         # 상태 메시지 리스트 위젯
         self.status_list = QListWidget()
         self.layout.addWidget(self.status_list)
@@ -51,6 +82,9 @@ class ClientGUI(QMainWindow):
         self.select_button.clicked.connect(self.select_file)
         self.send_button.clicked.connect(self.send_file)
 
+        self.send_thread = None
+        self.send_worker = None
+
     @Slot()
     def select_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "파일 선택")
@@ -74,30 +108,54 @@ class ClientGUI(QMainWindow):
 
         port = int(port_text)
         self.target_address = (ip_address, port)
-        
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                filename = os.path.basename(self.selected_file_path)
-                
-                start_message = f"START_FILE:{filename}"
-                s.sendto(start_message.encode('utf-8'), self.target_address)
-                self.status_list.addItem(f"파일 전송 시작: '{filename}'")
-                
-                with open(self.selected_file_path, 'rb') as f:
-                    while True:
-                        chunk = f.read(1024)
-                        if not chunk:
-                            break
-                        s.sendto(chunk, self.target_address)
-                
-                s.sendto("END_FILE".encode('utf-8'), self.target_address)
-                self.status_list.addItem("파일 전송이 완료되었습니다.")
-                self.status_list.addItem("서버의 저장을 확인하세요.")
-                
-        except Exception as e:
-            self.status_list.addItem(f"전송 오류: {e}")
+
+        filename = os.path.basename(self.selected_file_path)
+        self.status_list.addItem(f"파일 전송 시작: '{filename}'")
+        # 순서 번호/재전송이 있는 프로토콜로 보내고 서버가 저장을 마칠 때까지 기다림 (작업 스레드에서)
+        self.send_thread = QThread()
+        self.send_worker = FileSender(self.selected_file_path, self.target_address)
+        self.send_worker.moveToThread(self.send_thread)
+        self.send_thread.started.connect(self.send_worker.run)
+        self.send_worker.progress_updated.connect(self.update_progress)
+        self.send_worker.finished.connect(self.send_finished)
+        self.send_worker.failed.connect(self.send_failed)
+        self.send_thread.start()
+
+        self.send_button.setEnabled(False)
+        self.select_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+
+    @Slot("qint64", "qint64", float, float)
+    def update_progress(self, done, total, rate, eta):
+        mb = 1024 * 1024
+        eta_text = f"{eta:.0f}초" if eta != float("inf") else "-"
+        self.progress_label.setText(f"{done / mb:.1f} / {total / mb:.1f} MB, {rate / mb:.1f} MB/s, 남은 시간 {eta_text}")
+        self.progress_bar.setValue(done * 1000 // total if total else 1000)
+
+    @Slot("qint64")
+    def send_finished(self, size):
+        self.status_list.addItem(f"파일 전송이 완료되었습니다. ({size} bytes)")
+        self.status_list.addItem("서버가 파일 저장을 확인했습니다.")
+        self.stop_sending()
+
+    @Slot(str)
+    def send_failed(self, reason):
+        self.status_list.addItem(f"전송 오류: {reason}")
+        self.stop_sending()
+
+    def stop_sending(self):
+        # 작업 스레드의 run() 이 끝난 뒤 호출되므로 스레드는 곧바로 끝남
+        if self.send_thread:
+            self.send_thread.quit()
+            self.send_thread.wait()
+            self.send_worker = None
+            self.send_thread = None
+        self.send_button.setEnabled(True)
+        self.select_button.setEnabled(True)
 
     def closeEvent(self, event):
+        # 전송 중이면 끝날 때까지 (응답이 없으면 재시도 한도까지) 기다림
+        self.stop_sending()
         event.accept()
 
 if __name__ == "__main__":
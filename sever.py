@@ -1,88 +1,86 @@
 # server_app.py
 
+import asyncio
 import sys
-import socket
-import threading
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                               QLabel, QLineEdit, QPushButton, QListWidget)
+                               QLabel, QLineEdit, QPushButton, QListWidget, QProgressBar)
 from PySide6.QtCore import Signal, QThread, QObject, Slot
 import os
+import time
+
+from udp_protocol import MAX_CHUNK_SIZE, PROGRESS_INTERVAL
+from udp_transfer import start_receiver
+
+# 로그 목록에 남기는 최대 항목 수 (오래된 항목부터 지움)
+MAX_LOG_ITEMS = 1000
+# 진행 상황 표시에 한 줄씩 보여 주는 최대 파일 수
+MAX_PROGRESS_LINES = 8
 
 class UdpFileServer(QObject):
     message_received = Signal(str)
+    # 파일 이름, 받은 바이트, 전체 바이트, 초당 바이트, 남은 시간(초). 최대 10 Hz 로만 보냄
+    # 바이트 수는 2 GiB 를 넘을 수 있으므로 qint64 (Signal 의 int 는 32비트)
+    progress_updated = Signal(str, "qint64", "qint64", float, float)
+    # 수신이 끝나거나 취소된 파일 이름
+    transfer_finished = Signal(str)
 
-    def __init__(self, port):
+    def __init__(self, port, max_chunk_size=MAX_CHUNK_SIZE, output_dir=None):
         super().__init__()
         self.port = port
-        self.running = False
-        self.sock = None
-        self.receiving_file = False
-        self.file_path = None
-        self.file_handle = None
+        self.max_chunk_size = max_chunk_size
+        self.output_dir = output_dir or os.getcwd()
+        # run() 이 시작되기 전에 stop_server() 가 불려도 바로 끝나도록 미리 설정
+        self.running = True
 
     @Slot()
     def run(self):
+        # 수신은 udp_transfer 의 asyncio 수신 쪽이 처리하고, 이 스레드는 진행 상황만 GUI 로 전달
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.sock.bind(('0.0.0.0', self.port))
-            self.sock.settimeout(1.0) # 논블로킹을 위한 타임아웃 설정
-            self.running = True
-            self.message_received.emit(f"서버가 포트 {self.port}에서 대기 중입니다.")
-            
-            while self.running:
-                try:
-                    data, addr = self.sock.recvfrom(1024)
-                    # 수신된 데이터가 텍스트 메시지인지 확인
-                    try:
-                        message = data.decode('utf-8')
-                        if message.startswith("START_FILE:"):
-                            filename = "rx_" + message.replace("START_FILE:", "").strip()
-                            self.file_path = os.path.join(os.getcwd(), filename)
-                            self.file_handle = open(self.file_path, 'wb')
-                            self.receiving_file = True
-                            self.message_received.emit(f"파일 '{filename}' 수신을 시작합니다...")
-                            print("file name")
-                        elif message == "END_FILE":
-                            print("end_file1")
-                            if self.receiving_file and self.file_handle:
-                                print("end_file2")
-                                self.file_handle.close()
-                                self.file_handle = None
-                                self.receiving_file = False
-                                self.message_received.emit(f"파일 '{os.path.basename(self.file_path)}' 수신 및 저장이 완료되었습니다.")
-                                self.file_path = None
-                        else:
-                            #print("rx1",data,"\n")
-                            if self.receiving_file and self.file_handle:
-                                print("rx2",data,"\n")
-                                self.file_handle.write(data)
-                                self.message_received.emit(f"데이터 패킷을 수신했습니다. ({len(data)} bytes)")
-
-                            
-                    except UnicodeDecodeError:
-                        # 텍스트로 디코딩할 수 없는 경우, 파일 데이터로 간주
-                        print("rx2",data,"\n")
-                        
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    if self.running:
-                        self.message_received.emit(f"오류: {e}")
-                    self.running = False
+            asyncio.run(self.serve())
         except Exception as e:
             self.message_received.emit(f"시작 오류: {e}")
-            self.running = False
         finally:
-            if self.sock:
-                self.sock.close()
+            self.running = False
             self.message_received.emit("서버가 중지되었습니다.")
 
+    async def serve(self):
+        transport, protocol = await start_receiver(port=self.port, output_dir=self.output_dir,
+                                                   max_chunk_size=self.max_chunk_size,
+                                                   on_event=self.on_transfer_event)
+        self.message_received.emit(f"서버가 포트 {self.port}에서 대기 중입니다.")
+        try:
+            while self.running:
+                # 패킷마다 로그를 남기지 않고, 진행 중인 전송의 진행 상황을 10 Hz 로 모아서 알림
+                await asyncio.sleep(PROGRESS_INTERVAL)
+                now = time.monotonic()
+                for session in protocol.receiver.active_sessions():
+                    self.publish_progress(session, now)
+        finally:
+            transport.close()
+            # connection_lost 에서 진행 중인 전송을 정리할 차례를 줌
+            await asyncio.sleep(0)
+
+    def publish_progress(self, session, now, force=False):
+        update = session.progress.update(session.received_bytes, now, force)
+        if update is not None:
+            self.progress_updated.emit(session.name, *update)
+
+    def on_transfer_event(self, event, session):
+        if event == "start":
+            self.message_received.emit(f"파일 '{session.name}' 수신을 시작합니다... ({session.addr[0]})")
+            return
+        if event == "complete":
+            self.publish_progress(session, time.monotonic(), force=True)
+            self.message_received.emit(f"파일 '{session.name}' 수신 및 저장이 완료되었습니다.")
+        elif event == "aborted":
+            self.message_received.emit(f"파일 '{session.name}' 수신이 취소되었습니다.")
+        elif event == "expired":
+            self.message_received.emit(f"파일 '{session.name}' 수신이 응답 없음으로 중단되었습니다.")
+        self.transfer_finished.emit(session.name)
+
     def stop_server(self):
+        # 수신 스레드의 이벤트 루프가 빠져나오면서 소켓을 닫고 진행 중인 전송을 정리함
         self.running = False
-        if self.sock:
-            self.sock.close()
-        if self.file_handle:
-            self.file_handle.close()
 
 class ServerGUI(QMainWindow):
     def __init__(self):
@@ -106,6 +104,12 @@ class ServerGUI(QMainWindow):
         self.port_layout.addWidget(self.stop_button)
         self.layout.addLayout(self.port_layout)
         
+        self.progress_label = QLabel("수신 중인 파일 없음")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.layout.addWidget(self.progress_label)
+        self.layout.addWidget(self.progress_bar)
+
         self.message_list = QListWidget()
         self.layout.addWidget(self.message_list)
         
@@ -114,6 +118,8 @@ class ServerGUI(QMainWindow):
         
         self.server_thread = None
         self.server_worker = None
+        # 수신 중인 파일별 (받은 바이트, 전체 바이트, 속도, 남은 시간)
+        self.transfers = {}
 
     @Slot()
     def start_server(self):
@@ -128,6 +134,8 @@ class ServerGUI(QMainWindow):
         self.server_worker.moveToThread(self.server_thread)
         self.server_thread.started.connect(self.server_worker.run)
         self.server_worker.message_received.connect(self.update_log)
+        self.server_worker.progress_updated.connect(self.update_progress)
+        self.server_worker.transfer_finished.connect(self.remove_progress)
         self.server_thread.start()
         
         self.start_button.setEnabled(False)
@@ -150,6 +158,39 @@ class ServerGUI(QMainWindow):
     @Slot(str)
     def update_log(self, message):
         self.message_list.addItem(message)
+        while self.message_list.count() > MAX_LOG_ITEMS:
+            self.message_list.takeItem(0)
+        self.message_list.scrollToBottom()
+
+    @Slot(str, "qint64", "qint64", float, float)
+    def update_progress(self, name, done, total, rate, eta):
+        self.transfers[name] = (done, total, rate, eta)
+        self.show_progress()
+
+    @Slot(str)
+    def remove_progress(self, name):
+        self.transfers.pop(name, None)
+        self.show_progress()
+
+    def show_progress(self):
+        if not self.transfers:
+            self.progress_label.setText("수신 중인 파일 없음")
+            self.progress_bar.setValue(0)
+            return
+
+        mb = 1024 * 1024
+        lines = []
+        for name, (done, total, rate, eta) in list(self.transfers.items())[:MAX_PROGRESS_LINES]:
+            eta_text = f"{eta:.0f}초" if eta != float("inf") else "-"
+            lines.append(f"{name}: {done / mb:.1f} / {total / mb:.1f} MB, {rate / mb:.1f} MB/s, 남은 시간 {eta_text}")
+        if len(self.transfers) > MAX_PROGRESS_LINES:
+            lines.append(f"... 외 {len(self.transfers) - MAX_PROGRESS_LINES}개")
+        self.progress_label.setText("\n".join(lines))
+
+        # 진행 막대는 수신 중인 전체 파일 기준
+        done = sum(t[0] for t in self.transfers.values())
+        total = sum(t[1] for t in self.transfers.values())
+        self.progress_bar.setValue(done * 1000 // total if total else 1000)
 
     def closeEvent(self, event):
         self.stop_server()
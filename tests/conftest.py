@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 최상위의 모듈을 테스트에서 바로 import 할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def write_video(tmp_path):
+    """
+    프레임별 밝기 목록으로 합성 동영상을 만드는 함수를 돌려줍니다.
+    밝기가 None 인 프레임은 점 노이즈로 채웁니다.
+    """
+    cv2 = pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+
+    def write(levels, codec="MJPG", size=(64, 48), name=None):
+        ext = ".avi" if codec == "MJPG" else ".mp4"
+        path = str(tmp_path / (name or f"synthetic_{codec}{ext}"))
+        rng = np.random.default_rng(0)
+        width, height = size
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), 30, size)
+        for level in levels:
+            if level is None:
+                gray = rng.integers(0, 2, (height, width), dtype=np.uint8) * 255
+            else:
+                gray = np.full((height, width), level, dtype=np.uint8)
+            writer.write(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+        writer.release()
+        return path
+
+    return write
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from cam_capture import open_capture  # noqa: E402
+from cam_source import seek_frame  # noqa: E402
+
+
+@pytest.mark.parametrize("backend", ["ffmpeg", "pyav"])
+def test_open_missing_file(tmp_path, backend):
+    if backend == "pyav":
+        pytest.importorskip("av")
+    cap = open_capture(os.path.join(str(tmp_path), "missing.mp4"), backend=backend, gray=True)
+    assert not cap.isOpened()
+    assert cap.read() == (False, None)
+    cap.release()
+
+
+def _write_counter_video(path, frames=200):
+    # 프레임 번호마다 밝기가 다른 동영상 (번호 * 1 + 20)
+    np = pytest.importorskip("numpy")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30, (64, 48))
+    for index in range(frames):
+        writer.write(np.full((48, 64, 3), 20 + index, dtype=np.uint8))
+    writer.release()
+
+
+@pytest.mark.parametrize("backend", ["ffmpeg", "pyav"])
+def test_seek_matches_sequential_read(tmp_path, backend):
+    if backend == "pyav":
+        pytest.importorskip("av")
+    path = os.path.join(str(tmp_path), "counter.mp4")
+    _write_counter_video(path)
+
+    cap = open_capture(path, backend=backend, gray=True)
+    expected = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        expected.append(float(frame.mean()))
+
+    for target in (150, 10, 120, 0, 199):
+        assert seek_frame(cap, target)
+        ret, frame = cap.read()
+        assert ret
+        assert abs(float(frame.mean()) - expected[target]) < 2
+    cap.release()
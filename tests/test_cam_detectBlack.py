@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from cam_detectBlack import detect_black_intervals_sampled, find_black_intervals  # noqa: E402
+
+
+@pytest.mark.parametrize("codec", ["MJPG", "mp4v"])
+@pytest.mark.parametrize("step", [None, 3, 10])
+def test_sampled_matches_dense_scan(write_video, codec, step):
+    levels = [120] * 200
+    # 최소 길이(10)와 같은 구간, 더 긴 구간, 짧아서 보고하지 않는 구간, 파일 끝까지 이어지는 구간
+    levels[10:20] = [0] * 10
+    levels[47:81] = [5] * 34
+    levels[100:109] = [0] * 9
+    levels[130:131] = [0]
+    levels[185:] = [0] * 15
+    path = write_video(levels, codec)
+
+    dense = find_black_intervals(path, duration_frames=10)
+    sampled = detect_black_intervals_sampled(path, duration_frames=10, step=step)
+    assert [(interval["start"], interval["end"]) for interval in dense] == [(10, 19), (47, 80), (185, 199)]
+    assert sampled == dense
@@ -0,0 +1,48 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cam_findBroken import detect_tile_glitch, tile_stats, tile_stddev  # noqa: E402
+
+
+def _textured(height=256, width=512, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width), dtype=np.uint8)
+
+
+def test_tile_stats_matches_mean_std_dev():
+    frame = _textured()
+    mean, stddev = tile_stats(frame, 64)
+    block = frame[64:128, 128:192]
+    block_mean, block_std = cv2.meanStdDev(block)
+    assert mean.shape == (4, 8)
+    assert mean[1, 2] == pytest.approx(block_mean[0][0])
+    assert stddev[1, 2] == pytest.approx(block_std[0][0])
+
+
+def test_sampled_tile_stddev_close_to_full():
+    frame = _textured()
+    _, full = tile_stats(frame, 64)
+    assert tile_stddev(frame, 64).shape == full.shape
+    assert np.allclose(tile_stddev(frame, 64), full, rtol=0.1)
+    assert np.allclose(tile_stddev(frame, 60), tile_stats(frame[:240, :480], 60)[1])
+
+
+def test_flat_tile_is_detected():
+    prev = _textured()
+    current = prev.copy()
+    # 블록 하나를 평균 밝기로 채움: 대부분의 픽셀이 threshold 보다 적게 바뀌어도 평탄해진 블록으로 잡힘
+    current[64:128, 128:192] = 128
+    tiles = detect_tile_glitch(prev, current, min_tile_change=0.9)
+    assert [(tile["x"], tile["y"]) for tile in tiles] == [(128, 64)]
+    assert tiles[0]["stddev"] == 0.0
+    # 직전 호출에서 구한 표준 편차를 넘겨도 결과가 같음 (TileGlitchDetector 의 방식)
+    reused = detect_tile_glitch(prev, current, min_tile_change=0.9, prev_std=tile_stddev(prev, 64),
+                                current_std=tile_stddev(current, 64))
+    assert reused == tiles
+
+
+def test_whole_frame_change_is_ignored():
+    prev = _textured()
+    assert detect_tile_glitch(prev, np.zeros_like(prev)) == []
+    assert detect_tile_glitch(prev, _textured(seed=1)) == []
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cam_engine import FrameDetector  # noqa: E402
+from cam_monitor import StreamMonitor  # noqa: E402
+
+
+class RecordingDetector(FrameDetector):
+    # 분석한 프레임 번호를 기록하고, delay 초씩 걸려 분석이 캡처보다 느리게 만듦
+    name = "recording"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.indices = []
+
+    def process(self, index, frame, gray):
+        self.indices.append(index)
+        time.sleep(self.delay)
+        return []
+
+
+class FlakyCapture:
+    # 읽기 결과 목록을 차례로 돌려주는 캡처 객체. 목록이 끝나면 계속 실패
+    def __init__(self, script):
+        self.script = list(script)
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        if not self.script:
+            return False, None
+        ok = self.script.pop(0)
+        return (True, np.full((8, 8, 3), 100, dtype=np.uint8)) if ok else (False, None)
+
+
+def _frames(count):
+    for _ in range(count):
+        yield np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def test_live_source_drops_oldest_frames():
+    detector = RecordingDetector(delay=0.02)
+    monitor = StreamMonitor(_frames(100), detectors=[detector], queue_size=2, live=True)
+    assert monitor.drop_frames
+    monitor.run()
+
+    assert monitor.frames_captured == 100
+    assert monitor.frames_dropped > 0
+    assert monitor.frames_processed + monitor.frames_dropped == 100
+    assert monitor.frames.qsize() == 0
+    # 버린 것은 오래된 프레임이므로 순서는 유지되고 마지막 프레임은 분석됨
+    assert detector.indices == sorted(detector.indices)
+    assert detector.indices[-1] == 99
+
+
+def test_file_like_source_keeps_every_frame():
+    detector = RecordingDetector(delay=0.001)
+    monitor = StreamMonitor(_frames(20), detectors=[detector], queue_size=2)
+    assert not monitor.drop_frames
+    monitor.run()
+    assert detector.indices == list(range(20))
+    assert monitor.frames_dropped == 0
+
+
+@pytest.mark.parametrize("live", [True, False])
+def test_capture_object_reconnect(live):
+    cap = FlakyCapture([True, True, False, False, True, True, True])
+    detector = RecordingDetector()
+    monitor = StreamMonitor(cap, detectors=[detector], reconnect_delay=0.0, queue_size=10, live=live,
+                            drop_frames=False)
+    monitor.run(max_frames=5 if live else None)
+    # 실시간이면 읽기 실패 뒤에도 다시 읽어 나머지 프레임까지 분석하고, 아니면 첫 실패에서 끝남
+    assert monitor.frames_processed == (5 if live else 2)
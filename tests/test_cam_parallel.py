@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+import cam_parallel  # noqa: E402
+from cam_parallel import compute_frame_stats_parallel  # noqa: E402
+from cam_stats import compute_frame_stats  # noqa: E402
+
+
+@pytest.mark.parametrize("codec", ["MJPG", "mp4v"])
+def test_parallel_stats_match_sequential(write_video, monkeypatch, codec):
+    # 밝기 변화, 블랙 구간, 노이즈가 섞인 240 프레임. 구간 경계가 여러 곳에 걸리도록 짧게 나눔
+    levels = [40 + (index * 7) % 180 for index in range(240)]
+    levels[50:70] = [0] * 20
+    levels[118:124] = [None] * 6
+    path = write_video(levels, codec)
+    monkeypatch.setattr(cam_parallel, "MIN_SEGMENT_FRAMES", 30)
+
+    sequential = compute_frame_stats(path)
+    parallel = compute_frame_stats_parallel(path, workers=2)
+    assert len(sequential) == 240
+    assert parallel.dtype == sequential.dtype
+    for name in sequential.dtype.names:
+        np.testing.assert_array_equal(parallel[name], sequential[name], err_msg=name)
@@ -0,0 +1,42 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from cam_phash import HashIndex, dhash, hamming_distance  # noqa: E402
+
+
+def _scene(width, height, seed=0):
+    # 부드럽게 변하는 무늬 (실제 화면처럼 이웃 픽셀끼리 비슷함)
+    small = np.random.default_rng(seed).integers(0, 256, (9, 16), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+def test_prescaled_hash_matches_full_resolution():
+    gray = _scene(3840, 2160)
+    # 원본 해상도에서 바로 9x8 로 줄인 해시
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    full = int(np.packbits(small[:, 1:] > small[:, :-1]).view(">u8")[0])
+    assert hamming_distance(dhash(gray), full) <= 2
+
+
+def test_different_scenes_have_distant_hashes():
+    assert hamming_distance(dhash(_scene(3840, 2160, 0)), dhash(_scene(3840, 2160, 1))) > 10
+
+
+def test_hash_index_search_and_reload(tmp_path):
+    index = HashIndex()
+    index.add("a.mp4", np.array([1, 2, 3], dtype=np.uint64))
+    index.add("empty.mp4", np.zeros(0, dtype=np.uint64))
+    index.add("b.mp4", np.array([0xFF, 3], dtype=np.uint64))
+    assert len(index) == 5
+    assert index.search(3, max_distance=0) == [("a.mp4", 2, 0), ("b.mp4", 1, 0)]
+    # 검색 뒤에 추가한 해시도 찾음
+    index.add("c.mp4", np.array([0xFE], dtype=np.uint64))
+    assert index.search(0xFF, max_distance=1) == [("b.mp4", 0, 0), ("c.mp4", 0, 1)]
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = HashIndex.load(path)
+    assert len(loaded) == 6
+    assert loaded.search(0xFF, max_distance=1) == index.search(0xFF, max_distance=1)
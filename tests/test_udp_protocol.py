@@ -0,0 +1,125 @@
+import io
+import os
+import random
+import shutil
+
+import pytest
+
+from udp_protocol import (ABORT, ACK, ACK_INFO, DATA, FLAG_RETRANSMIT, START, START_INFO, STATUS, ReceiveSession,
+                          SendSession, TransferReceiver, decode_packet, encode_packet, parse_start, receive_window)
+
+ADDR = ("127.0.0.1", 50000)
+
+
+def _start_packet(transfer_id, size, chunk_size, name="video.mp4", window=64):
+    payload = START_INFO.pack(size, chunk_size, window) + name.encode("utf-8")
+    return encode_packet(START, transfer_id, 0, payload)
+
+
+def _abort_reason(replies):
+    assert len(replies) == 1
+    kind, _, _, _, payload = decode_packet(replies[0])
+    assert kind == ABORT
+    return bytes(payload)
+
+
+def test_huge_start_is_rejected_without_file(tmp_path):
+    receiver = TransferReceiver(str(tmp_path))
+    replies = receiver.handle_datagram(_start_packet(1, 2 ** 62, 1), ADDR, 0.0)
+    assert _abort_reason(replies) == b"too many chunks"
+    assert os.listdir(str(tmp_path)) == []
+    assert receiver.sessions == {}
+
+
+def test_start_larger_than_free_space(tmp_path):
+    receiver = TransferReceiver(str(tmp_path), max_chunks=2 ** 40)
+    size = shutil.disk_usage(str(tmp_path)).free + 2 ** 30
+    replies = receiver.handle_datagram(_start_packet(1, size, 60000), ADDR, 0.0)
+    assert _abort_reason(replies) == b"not enough space"
+    assert os.listdir(str(tmp_path)) == []
+    assert receiver.sessions == {}
+
+
+def test_max_file_size(tmp_path):
+    receiver = TransferReceiver(str(tmp_path), max_file_size=1000)
+    assert _abort_reason(receiver.handle_datagram(_start_packet(1, 1001, 100), ADDR, 0.0)) == b"file too large"
+    assert receiver.handle_datagram(_start_packet(2, 1000, 100), ADDR, 0.0)
+    assert os.listdir(str(tmp_path)) == ["rx_video.mp4"]
+    receiver.close()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_transfer_between_sessions(tmp_path):
+    data = os.urandom(100000)
+    receiver = TransferReceiver(str(tmp_path))
+    sender = SendSession(7, "clip.bin", len(data), io.BytesIO(data), chunk_size=1000, window=32)
+    now = 0.0
+    while not sender.finished:
+        now += 0.01
+        replies = []
+        for packet in sender.packets(now):
+            replies += receiver.handle_datagram(packet, ADDR, now)
+        for reply in replies:
+            sender.handle_packet(reply, now)
+    assert not sender.failed
+    with open(os.path.join(str(tmp_path), "rx_clip.bin"), "rb") as f:
+        assert f.read() == data
+
+
+def test_window_limited_by_receive_buffer(tmp_path):
+    receiver = TransferReceiver(str(tmp_path), receive_buffer=256 * 1024)
+    sender = SendSession(3, "clip.bin", 10 ** 6, io.BytesIO(bytes(10 ** 6)), chunk_size=1400)
+    assert sender.window > receive_window(256 * 1024, 1400)
+    replies = receiver.handle_datagram(sender.packets(0.0)[0], ADDR, 0.0)
+    kind, _, _, _, payload = decode_packet(replies[0])
+    assert kind == ACK
+    assert ACK_INFO.unpack_from(payload) == (1400, receive_window(256 * 1024, 1400))
+    sender.handle_packet(replies[0], 0.0)
+    assert sender.window == receive_window(256 * 1024, 1400)
+    assert len(sender.packets(0.0)) <= sender.window
+    receiver.close()
+
+
+class _KeepOpen(io.BytesIO):
+    # 수신 세션이 완료 때 close()해도 내용을 확인할 수 있도록 닫지 않음
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lossy_reordered_transfer(seed):
+    rng = random.Random(seed)
+    data = rng.randbytes(200000)
+    sender = SendSession(9, "clip.bin", len(data), io.BytesIO(data), chunk_size=1000, window=64, timeout=0.05)
+    output = _KeepOpen()
+    receiver = None
+    retransmitted = 0
+    now = 0.0
+    for _ in range(100000):
+        if sender.finished:
+            break
+        # DATA 와 STATUS 는 20% 를 버리고 순서를 섞음 (START/ACK/DONE 은 그대로 전달)
+        to_receiver = [packet for packet in sender.packets(now)
+                       if decode_packet(packet)[0] != DATA or rng.random() >= 0.2]
+        rng.shuffle(to_receiver)
+        to_sender = []
+        for packet in to_receiver:
+            kind, flags, transfer_id, seq, payload = decode_packet(packet)
+            if kind == DATA and flags & FLAG_RETRANSMIT:
+                retransmitted += 1
+            if kind == START and receiver is None:
+                size, chunk_size, window, name = parse_start(payload)
+                receiver = ReceiveSession(transfer_id, name, size, chunk_size, output, window)
+            if receiver is not None:
+                to_sender += receiver.handle(kind, flags, seq, payload)
+        to_sender = [packet for packet in to_sender
+                     if decode_packet(packet)[0] != STATUS or rng.random() >= 0.2]
+        rng.shuffle(to_sender)
+        for packet in to_sender:
+            sender.handle_packet(packet, now)
+        now += 0.01
+
+    assert sender.finished and not sender.failed, sender.error
+    assert receiver.complete
+    assert output.getvalue() == data
+    assert retransmitted > 0
@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+from udp_transfer import send_files, start_receiver
+
+
+def test_loopback_send_files(tmp_path):
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+    sizes = [0, 1, 1400, 3 * 1024 * 1024 + 17]
+    paths = []
+    for index, size in enumerate(sizes):
+        path = source / f"file{index}.bin"
+        path.write_bytes(os.urandom(size))
+        paths.append(str(path))
+
+    progress = []
+
+    async def run():
+        transport, protocol = await start_receiver("127.0.0.1", 0, str(output))
+        try:
+            return await send_files(protocol.address, paths, on_progress=lambda *update: progress.append(update))
+        finally:
+            transport.close()
+            await asyncio.sleep(0)
+
+    results = asyncio.run(run())
+    assert results == sizes
+    for path in paths:
+        with open(path, "rb") as f:
+            expected = f.read()
+        assert (output / ("rx_" + os.path.basename(path))).read_bytes() == expected
+    # 파일마다 마지막에는 완료(전체 크기)로 알림
+    assert sum(1 for done, total, rate, eta in progress if done == total) >= len(sizes)
@@ -0,0 +1,643 @@
+import collections
+import os
+import shutil
+import socket
+import struct
+import sys
+import time
+
+# 모든 패킷 앞에 붙는 헤더: magic, version, kind, flags, transfer_id, seq
+HEADER = struct.Struct("!HBBHII")
+MAGIC = 0x4154  # "AT"
+VERSION = 3
+
+# 패킷 종류
+START = 1   # 송신 -> 수신: 파일 정보 (START_INFO + 파일 이름)
+ACK = 2     # 수신 -> 송신: START 수락 (ACK_INFO)
+DATA = 3    # 송신 -> 수신: 파일 조각 (seq = 조각 번호)
+POLL = 4    # 송신 -> 수신: 상태 요청 (seq = 지금까지 한 번 이상 보낸 조각 수)
+STATUS = 5  # 수신 -> 송신: 연속 수신 조각 수와 누락 구간 (선택적 재전송 요청)
+DONE = 6    # 수신 -> 송신: 모든 조각을 받아 저장을 마침
+ABORT = 7   # 양방향: 전송 취소 (payload 는 사유)
+
+# 헤더 flags
+FLAG_RETRANSMIT = 0x0001
+
+START_INFO = struct.Struct("!QII")  # 파일 크기, 요청 조각 크기, 창 크기(조각 수)
+ACK_INFO = struct.Struct("!II")     # 수신 쪽이 허용한 조각 크기, 창 크기(조각 수)
+STATUS_INFO = struct.Struct("!II")  # 연속 수신 조각 수, 누락 구간 수
+RANGE = struct.Struct("!II")        # 누락 구간 [start, end)
+
+# 경로 MTU 를 알 수 없을 때의 조각 크기:
+# 이더넷 MTU(1500) - IP/UDP 헤더(28) - 프로토콜 헤더(14) 안에 들어감
+DEFAULT_CHUNK_SIZE = 1400
+IP_UDP_OVERHEAD = 28
+# UDP 데이터그램 하나에 담을 수 있는 최대 조각 크기 (65507 - 헤더)
+MAX_CHUNK_SIZE = 65507 - HEADER.size
+# 창 크기를 조각 수 대신 바이트로 정할 때 한 번에 보내 둘 수 있는 양
+DEFAULT_WINDOW_BYTES = 4 * 1024 * 1024
+DEFAULT_SOCKET_BUFFER = 8 * 1024 * 1024
+# Linux 의 IP_MTU 소켓 옵션 (Python socket 모듈에 상수가 없음)
+IP_MTU = 14
+DEFAULT_TIMEOUT = 0.2
+DEFAULT_MAX_RETRIES = 50
+# STATUS 하나에 담는 최대 누락 구간 수
+MAX_STATUS_RANGES = 128
+MAX_DATAGRAM = 65535
+# 진행 상황을 알리는 최소 간격 (초). 패킷마다 알리지 않도록 10 Hz 로 제한
+PROGRESS_INTERVAL = 0.1
+# 전송 하나의 최대 조각 수. 수신 쪽은 조각마다 1 바이트의 수신 표시를 메모리에 두므로 상한을 둠
+# (기본 조각 크기로 약 90 GB)
+MAX_TRANSFER_CHUNKS = 1 << 26
+
+
+class ProtocolError(ValueError):
+    """프로토콜 형식에 맞지 않는 패킷."""
+
+
+class TransferError(Exception):
+    """전송 실패 (응답 없음, 상대가 취소 등)."""
+
+
+def new_transfer_id():
+    return int.from_bytes(os.urandom(4), "big")
+
+
+def encode_packet(kind, transfer_id, seq=0, payload=b"", flags=0):
+    return HEADER.pack(MAGIC, VERSION, kind, flags, transfer_id, seq) + payload
+
+
+def decode_packet(data):
+    """
+    수신한 데이터그램을 헤더와 payload 로 나눕니다.
+
+    Returns:
+        tuple: (kind, flags, transfer_id, seq, payload). payload 는 복사하지 않은 memoryview.
+
+    Raises:
+        ProtocolError: 헤더가 짧거나 magic/version 이 다른 경우.
+    """
+    if len(data) < HEADER.size:
+        raise ProtocolError("packet too short")
+    magic, version, kind, flags, transfer_id, seq = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError("unknown magic or version")
+    return kind, flags, transfer_id, seq, memoryview(data)[HEADER.size:]
+
+
+def parse_start(payload):
+    # START payload -> (파일 크기, 요청 조각 크기, 창 크기, 파일 이름)
+    if len(payload) < START_INFO.size:
+        raise ProtocolError("START payload too short")
+    size, chunk_size, window = START_INFO.unpack_from(payload)
+    if chunk_size == 0:
+        raise ProtocolError("chunk size must be positive")
+    name = bytes(payload[START_INFO.size:]).decode("utf-8", errors="replace")
+    return size, chunk_size, window, name
+
+
+def window_for(chunk_size, window_bytes=DEFAULT_WINDOW_BYTES):
+    # 조각 크기와 상관없이 한 번에 보내 두는 바이트 수가 비슷하도록 창 크기(조각 수)를 정함
+    return max(16, window_bytes // chunk_size)
+
+
+def tune_socket(sock, buffer_size=DEFAULT_SOCKET_BUFFER):
+    """
+    송수신 소켓 버퍼를 키웁니다. 큰 조각이 창 크기만큼 몰려와도 커널에서 버려지지 않게 합니다.
+    운영체제 상한(Linux 의 net.core.rmem_max 등)보다 크게 요청하면 상한까지만 적용되므로,
+    실제로 적용된 크기를 다시 읽어서 돌려줍니다.
+
+    Returns:
+        tuple: 실제 (SO_SNDBUF, SO_RCVBUF) 바이트 수. 읽을 수 없으면 요청한 크기
+    """
+    sizes = []
+    for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, buffer_size)
+        except OSError:
+            pass
+        try:
+            sizes.append(sock.getsockopt(socket.SOL_SOCKET, option))
+        except OSError:
+            sizes.append(buffer_size)
+    return tuple(sizes)
+
+
+def receive_window(receive_buffer, chunk_size):
+    """
+    수신 소켓 버퍼에 들어가는 조각 수. 수신 쪽은 창 크기를 이 값 이하로 알려 줍니다.
+    Linux 는 SO_RCVBUF 를 요청값의 두 배(커널 관리용 공간 포함)로 보고하므로 절반만 데이터로 칩니다.
+    """
+    return max(1, (receive_buffer // 2) // (chunk_size + HEADER.size + IP_UDP_OVERHEAD))
+
+
+def path_chunk_size(sock, fallback=DEFAULT_CHUNK_SIZE):
+    """
+    connect()한 UDP 소켓의 경로 MTU 에 맞는 조각 크기를 구합니다. (IP 조각화 없이 전송)
+    경로 MTU 를 얻을 수 없는 플랫폼에서는 fallback 을 돌려줍니다.
+    """
+    if not sys.platform.startswith("linux"):
+        return fallback
+    try:
+        mtu = sock.getsockopt(socket.IPPROTO_IP, IP_MTU)
+    except OSError:
+        return fallback
+    return max(fallback, min(MAX_CHUNK_SIZE, mtu - IP_UDP_OVERHEAD - HEADER.size))
+
+
+class SendSession:
+    """
+    파일 하나를 보내는 송신 쪽 상태 기계입니다. 소켓을 직접 다루지 않습니다.
+
+    packets(now)가 지금 보낼 데이터그램 목록을 돌려주고, 받은 응답은 handle_packet()으로 넘깁니다.
+    수신 쪽이 연속으로 받았다고 알려준 위치(acked)부터 window 개까지만 보내고,
+    STATUS 로 받은 누락 구간만 골라서 다시 보냅니다.
+
+    chunk_size 는 요청값이며, 수신 쪽이 ACK 로 더 작은 값을 허용하면 그 값으로 보냅니다.
+    window 가 None 이면 정해진 조각 크기로 window_for()를 적용하고, 수신 쪽이 ACK 로 더 작은
+    창 크기(수신 소켓 버퍼에 들어가는 조각 수)를 알려 주면 그 값으로 줄입니다.
+    """
+
+    def __init__(self, transfer_id, name, size, file, chunk_size=DEFAULT_CHUNK_SIZE, window=None,
+                 timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, burst=64):
+        self.transfer_id = transfer_id
+        self.name = name
+        self.size = size
+        self.file = file
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.burst = burst
+        self.requested_window = window
+        self._set_chunk_size(chunk_size)
+
+        self.started = False
+        self.finished = False
+        self.error = None
+        self.next_seq = 0       # 아직 한 번도 보내지 않은 첫 조각
+        self.acked = 0          # 수신 쪽이 연속으로 받은 조각 수
+        self.retransmit = collections.deque()
+        self.queued = set()
+        self.resent_at = {}
+        self.read_pos = 0
+        self.retries = 0
+        self.control_sent_at = None  # 응답을 기다리는 START/POLL 을 보낸 시각
+        self.last_heard = None
+        self.sent_since_poll = True
+
+    def _set_chunk_size(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.window = self.requested_window or window_for(chunk_size)
+        self.total = (self.size + chunk_size - 1) // chunk_size
+
+    def _data(self, seq, flags=0):
+        offset = seq * self.chunk_size
+        if offset != self.read_pos:
+            self.file.seek(offset)
+        chunk = self.file.read(self.chunk_size)
+        self.read_pos = offset + len(chunk)
+        return encode_packet(DATA, self.transfer_id, seq, chunk, flags)
+
+    def _control(self, packet, now):
+        # 응답이 없으면 timeout 마다 다시 보내고, max_retries 를 넘으면 실패
+        if self.control_sent_at is not None:
+            if now - self.control_sent_at < self.timeout:
+                return []
+            self.retries += 1
+            if self.retries > self.max_retries:
+                self.fail("no response from receiver")
+                return []
+        self.control_sent_at = now
+        return [packet]
+
+    def ready(self):
+        # 응답을 기다리지 않고 바로 보낼 조각이 있는지
+        if not self.started or self.finished:
+            return False
+        return bool(self.retransmit) or (self.next_seq < self.total and self.next_seq < self.acked + self.window)
+
+    def packets(self, now):
+        """지금 보내야 하는 데이터그램 목록 (최대 burst 개)."""
+        if self.finished:
+            return []
+        if not self.started:
+            info = START_INFO.pack(self.size, self.chunk_size, self.window) + self.name.encode("utf-8")
+            return self._control(encode_packet(START, self.transfer_id, 0, info), now)
+
+        out = []
+        while self.retransmit and len(out) < self.burst:
+            seq = self.retransmit.popleft()
+            self.queued.discard(seq)
+            if seq < self.acked:
+                continue
+            self.resent_at[seq] = now
+            out.append(self._data(seq, FLAG_RETRANSMIT))
+        while len(out) < self.burst and self.next_seq < self.total and self.next_seq < self.acked + self.window:
+            out.append(self._data(self.next_seq))
+            self.next_seq += 1
+        if out:
+            self.sent_since_poll = True
+            return out
+
+        # 보낼 것이 없음: 모두 보냈거나 창이 찼으면 수신 쪽 상태를 요청
+        if self.control_sent_at is None:
+            all_sent = self.next_seq >= self.total and self.sent_since_poll
+            if not all_sent and now - self.last_heard < self.timeout:
+                return []
+            self.sent_since_poll = False
+        return self._control(encode_packet(POLL, self.transfer_id, self.next_seq), now)
+
+    def handle_packet(self, data, now):
+        try:
+            kind, flags, transfer_id, seq, payload = decode_packet(data)
+        except ProtocolError:
+            return
+        if transfer_id != self.transfer_id or self.finished:
+            return
+
+        if kind == ABORT:
+            self.fail(bytes(payload).decode("utf-8", errors="replace") or "aborted by receiver")
+            return
+        if kind not in (ACK, STATUS, DONE):
+            return
+        self.last_heard = now
+        self.control_sent_at = None
+        self.retries = 0
+
+        if kind == ACK:
+            # 수신 쪽이 허용한 조각 크기와 창 크기로 줄임 (첫 DATA 를 보내기 전에만)
+            if not self.started and len(payload) >= ACK_INFO.size:
+                accepted, window = ACK_INFO.unpack_from(payload)
+                if 0 < accepted < self.chunk_size:
+                    self._set_chunk_size(accepted)
+                if 0 < window < self.window:
+                    self.window = window
+            self.started = True
+        elif kind == DONE:
+            self.started = True
+            self.finished = True
+        elif kind == STATUS and self.started:
+            self._handle_status(payload, now)
+
+    def _handle_status(self, payload, now):
+        if len(payload) < STATUS_INFO.size:
+            return
+        cumulative, count = STATUS_INFO.unpack_from(payload)
+        self.acked = max(self.acked, min(cumulative, self.total))
+        offset = STATUS_INFO.size
+        for _ in range(count):
+            if offset + RANGE.size > len(payload):
+                break
+            start, end = RANGE.unpack_from(payload, offset)
+            offset += RANGE.size
+            for seq in range(max(start, self.acked), min(end, self.next_seq)):
+                # 방금 다시 보낸 조각은 아직 가는 중일 수 있으므로 timeout 동안은 또 보내지 않음
+                if seq in self.queued or now - self.resent_at.get(seq, -self.timeout) < self.timeout:
+                    continue
+                self.queued.add(seq)
+                self.retransmit.append(seq)
+
+    def fail(self, reason):
+        self.error = reason
+        self.finished = True
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    @property
+    def acked_bytes(self):
+        # 수신 쪽이 연속으로 받았다고 확인한 바이트 수 (진행 상황 표시용)
+        if self.finished and not self.failed:
+            return self.size
+        return min(self.acked * self.chunk_size, self.size)
+
+
+class ReceiveSession:
+    """
+    파일 하나를 받는 수신 쪽 상태 기계입니다. 소켓을 직접 다루지 않습니다.
+
+    handle()은 받은 패킷을 처리하고 송신 쪽으로 보낼 응답 데이터그램 목록을 돌려줍니다.
+    조각은 순서와 상관없이 제자리(seq * chunk_size)에 쓰고, 새 누락이 생기거나
+    창의 1/4 을 받을 때마다 누락 구간을 STATUS 로 알려 줍니다.
+
+    chunk_size 와 window 는 수신 쪽이 허용한(협상된) 조각 크기와 창 크기이며 ACK 로 송신 쪽에 알려 줍니다.
+    file 을 None 으로 만들면 검증을 마친 뒤 attach()로 저장할 파일을 붙입니다.
+    """
+
+    def __init__(self, transfer_id, name, size, chunk_size, file, window=None):
+        self.transfer_id = transfer_id
+        self.name = name
+        self.size = size
+        self.chunk_size = chunk_size
+        self.file = None
+        self.window = window or window_for(chunk_size)
+        self.status_every = max(1, self.window // 4)
+        self.total = (size + chunk_size - 1) // chunk_size
+        self.received = bytearray(self.total)
+        self.received_count = 0
+        self.received_bytes = 0
+        self.cumulative = 0
+        self.highest = -1
+        self.since_status = 0
+        self.write_pos = 0
+        self.complete = False
+        self.aborted = False
+        if file is not None:
+            self.attach(file)
+
+    def attach(self, file):
+        # 순서가 바뀐 조각도 제자리에 쓸 수 있도록 미리 크기를 맞춤
+        self.file = file
+        file.truncate(self.size)
+        if self.total == 0:
+            self._finish()
+
+    def _finish(self):
+        self.file.close()
+        self.complete = True
+
+    def _packet(self, kind, seq=0, payload=b""):
+        return encode_packet(kind, self.transfer_id, seq, payload)
+
+    def status_packet(self, limit):
+        # [cumulative, limit) 사이의 받지 못한 구간
+        ranges = []
+        pos = self.cumulative
+        limit = min(limit, self.total)
+        while pos < limit and len(ranges) < MAX_STATUS_RANGES:
+            start = self.received.find(0, pos, limit)
+            if start < 0:
+                break
+            end = self.received.find(1, start, limit)
+            if end < 0:
+                end = limit
+            ranges.append(RANGE.pack(start, end))
+            pos = end
+        self.since_status = 0
+        payload = STATUS_INFO.pack(self.cumulative, len(ranges)) + b"".join(ranges)
+        return self._packet(STATUS, self.cumulative, payload)
+
+    def handle(self, kind, flags, seq, payload):
+        """
+        이 전송에 속한 패킷 하나를 처리합니다.
+
+        Returns:
+            list: 송신 쪽으로 보낼 응답 데이터그램 목록.
+        """
+        if kind == START:
+            # 첫 START 또는 ACK 가 손실되어 송신 쪽이 다시 보낸 START
+            return [self._packet(ACK, 0, ACK_INFO.pack(self.chunk_size, self.window))]
+        if kind == ABORT:
+            self.abort()
+            return []
+        if self.complete:
+            return [self._packet(DONE, self.total)] if kind == POLL else []
+        if self.aborted:
+            return []
+        if kind == POLL:
+            return [self.status_packet(max(seq, self.highest + 1))]
+        if kind != DATA:
+            return []
+
+        if seq >= self.total or self.received[seq]:
+            return []
+        expected = min(self.chunk_size, self.size - seq * self.chunk_size)
+        if len(payload) != expected:
+            return []
+
+        offset = seq * self.chunk_size
+        # 순서대로 들어오는 동안에는 seek 하지 않아야 파일 버퍼가 비워지지 않음
+        if offset != self.write_pos:
+            self.file.seek(offset)
+        self.file.write(payload)
+        self.write_pos = offset + expected
+        self.received[seq] = 1
+        self.received_count += 1
+        self.received_bytes += expected
+
+        gap = seq > self.highest + 1
+        self.highest = max(self.highest, seq)
+        if seq == self.cumulative:
+            next_missing = self.received.find(0, seq)
+            self.cumulative = self.total if next_missing < 0 else next_missing
+        if self.cumulative == self.total:
+            self._finish()
+            return [self._packet(DONE, self.total)]
+
+        self.since_status += 1
+        if gap or self.since_status >= self.status_every:
+            return [self.status_packet(self.highest + 1)]
+        return []
+
+    def abort(self):
+        if not self.complete and not self.aborted:
+            self.aborted = True
+            self.file.close()
+
+
+class ProgressMeter:
+    """
+    전송량을 받아서 interval 초에 한 번만 (전송량, 전체 크기, 평균 속도, 남은 시간)을 돌려줍니다.
+    패킷마다 update()를 불러도 실제로 알리는 횟수는 초당 1/interval 번으로 제한됩니다.
+    """
+
+    def __init__(self, total, interval=PROGRESS_INTERVAL, now=None):
+        self.total = total
+        self.interval = interval
+        self.started = time.monotonic() if now is None else now
+        self.last_time = self.started
+
+    def update(self, done, now, force=False):
+        """
+        Args:
+            done (int): 지금까지 전송한 바이트 수
+            now (float): time.monotonic() 기준 현재 시각
+            force (bool): 간격과 상관없이 알림 (전송 완료 등)
+
+        Returns:
+            tuple: (done, total, 초당 바이트, 남은 시간(초)). 알릴 때가 아니면 None
+        """
+        if not force and now - self.last_time < self.interval:
+            return None
+        self.last_time = now
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - done
+        if remaining <= 0:
+            eta = 0.0
+        else:
+            eta = remaining / rate if rate > 0 else float("inf")
+        return done, self.total, rate, eta
+
+
+class TransferReceiver:
+    """
+    여러 송신 쪽의 전송을 동시에 받는 수신 쪽 본체입니다. 소켓을 직접 다루지 않습니다.
+
+    전송은 (송신 주소, transfer_id)로 구분하며, 전송마다 ReceiveSession 과 자기만의 버퍼링된
+    파일 객체를 가지므로 동시에 들어오는 조각이 다른 파일에 섞이지 않습니다.
+    같은 이름의 파일이 이미 있으면 "rx_이름_1.확장자" 처럼 번호를 붙여 새 파일을 만듭니다.
+    idle_timeout 초 동안 패킷이 없는 전송은 expire()에서 정리하고, 끝나지 않은 파일은 지웁니다.
+    START 의 파일 크기가 max_file_size 나 남은 디스크 공간보다 크거나 조각 수가 max_chunks 를
+    넘으면 파일을 만들지 않고 ABORT 로 거절합니다.
+    receive_buffer(실제 SO_RCVBUF)를 지정하면 송신 쪽에 그 버퍼에 들어가는 창 크기만 허용합니다.
+
+    on_event(event, session) 은 "start", "complete", "aborted", "expired" 때 호출됩니다.
+    세션에는 path(저장 경로), addr(송신 주소), progress(ProgressMeter) 속성이 추가됩니다.
+    """
+
+    def __init__(self, output_dir=".", prefix="rx_", max_chunk_size=MAX_CHUNK_SIZE, max_sessions=256,
+                 idle_timeout=30.0, file_buffer=1024 * 1024, on_event=None, max_file_size=None,
+                 max_chunks=MAX_TRANSFER_CHUNKS, receive_buffer=None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_chunk_size = max_chunk_size
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.file_buffer = file_buffer
+        self.on_event = on_event
+        self.max_file_size = max_file_size
+        self.max_chunks = max_chunks
+        self.receive_buffer = receive_buffer
+        self.sessions = {}
+
+    def _notify(self, event, session):
+        if self.on_event is not None:
+            self.on_event(event, session)
+
+    def _create_file(self, name):
+        # 송신 쪽이 보낸 이름에서 경로는 버리고, 기존 파일과 겹치지 않는 이름으로 새로 만듦
+        stem, ext = os.path.splitext(self.prefix + os.path.basename(name.strip()))
+        number = 0
+        while True:
+            path = os.path.join(self.output_dir, f"{stem}_{number}{ext}" if number else stem + ext)
+            try:
+                return path, open(path, "xb", buffering=self.file_buffer)
+            except FileExistsError:
+                number += 1
+
+    def active_sessions(self):
+        return [session for session in self.sessions.values() if not (session.complete or session.aborted)]
+
+    def _check_size(self, size, chunk_size):
+        # 받을 수 없는 크기면 거절 사유, 받을 수 있으면 None
+        if self.max_file_size is not None and size > self.max_file_size:
+            return b"file too large"
+        if (size + chunk_size - 1) // chunk_size > self.max_chunks:
+            return b"too many chunks"
+        try:
+            free = shutil.disk_usage(self.output_dir).free
+        except OSError:
+            return b"cannot create file"
+        # 진행 중인 전송이 앞으로 쓸 공간도 이미 쓴 것으로 침 (truncate 한 파일은 공간을 차지하지 않음)
+        reserved = sum(session.size - session.received_bytes for session in self.active_sessions())
+        if size > free - reserved:
+            return b"not enough space"
+        return None
+
+    def _start(self, key, transfer_id, payload, now):
+        if len(self.active_sessions()) >= self.max_sessions:
+            return None, [encode_packet(ABORT, transfer_id, 0, b"receiver busy")]
+        try:
+            size, chunk_size, window, name = parse_start(payload)
+        except ProtocolError:
+            return None, []
+        chunk_size = min(chunk_size, self.max_chunk_size)
+        window = window or window_for(chunk_size)
+        if self.receive_buffer:
+            # 창 하나만큼 몰려와도 수신 소켓 버퍼에서 넘치지 않도록 제한
+            window = min(window, receive_window(self.receive_buffer, chunk_size))
+        reason = self._check_size(size, chunk_size)
+        if reason is not None:
+            return None, [encode_packet(ABORT, transfer_id, 0, reason)]
+
+        # 세션(수신 표시 메모리)을 먼저 만들고, 파일은 마지막에 만들어 실패하면 지움
+        try:
+            session = ReceiveSession(transfer_id, name, size, chunk_size, None, window)
+            session.path, file = self._create_file(name)
+        except (OSError, MemoryError):
+            return None, [encode_packet(ABORT, transfer_id, 0, b"cannot create file")]
+        session.name = os.path.basename(session.path)
+        try:
+            session.attach(file)
+        except OSError:
+            try:
+                file.close()
+            except OSError:
+                pass
+            self._remove_partial(session)
+            return None, [encode_packet(ABORT, transfer_id, 0, b"cannot create file")]
+        session.addr = key[0]
+        session.progress = ProgressMeter(size, now=now)
+        self.sessions[key] = session
+        self._notify("start", session)
+        if session.complete:
+            self._notify("complete", session)
+        return session, []
+
+    def handle_datagram(self, data, addr, now):
+        """
+        수신한 데이터그램 하나를 해당 전송에 넘깁니다.
+
+        Args:
+            data (bytes | memoryview): 수신한 데이터그램. 호출이 끝난 뒤에는 참조하지 않습니다.
+            addr (tuple): 송신 주소
+            now (float): time.monotonic() 기준 현재 시각
+
+        Returns:
+            list: addr 로 보낼 응답 데이터그램 목록
+        """
+        try:
+            kind, flags, transfer_id, seq, payload = decode_packet(data)
+        except ProtocolError:
+            return []
+        key = (addr, transfer_id)
+        session = self.sessions.get(key)
+        if session is None:
+            if kind == POLL:
+                # 수신 쪽이 재시작되어 전송 정보를 잃은 경우, 송신 쪽이 기다리지 않고 실패하도록 알림
+                return [encode_packet(ABORT, transfer_id, 0, b"unknown transfer")]
+            if kind != START:
+                return []
+            session, replies = self._start(key, transfer_id, payload, now)
+            if session is None:
+                return replies
+
+        session.last_active = now
+        was_finished = session.complete or session.aborted
+        replies = session.handle(kind, flags, seq, payload)
+        if not was_finished:
+            if session.complete:
+                self._notify("complete", session)
+            elif session.aborted:
+                self._remove_partial(session)
+                self._notify("aborted", session)
+        return replies
+
+    def _remove_partial(self, session):
+        try:
+            os.remove(session.path)
+        except OSError:
+            pass
+
+    def expire(self, now):
+        """
+        idle_timeout 동안 패킷이 없는 전송을 정리합니다. 끝난 전송은 늦게 온 POLL 에 DONE 으로
+        답할 수 있도록 idle_timeout 동안 남겨 두었다가 지웁니다.
+        """
+        for key, session in list(self.sessions.items()):
+            if now - session.last_active < self.idle_timeout:
+                continue
+            del self.sessions[key]
+            if not (session.complete or session.aborted):
+                session.abort()
+                self._remove_partial(session)
+                self._notify("expired", session)
+
+    def close(self):
+        # 진행 중인 전송을 모두 취소하고 끝나지 않은 파일을 지움
+        for session in self.active_sessions():
+            session.abort()
+            self._remove_partial(session)
+            self._notify("aborted", session)
+        self.sessions.clear()
@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import os
+
+from udp_protocol import (DEFAULT_SOCKET_BUFFER, DEFAULT_TIMEOUT, MAX_CHUNK_SIZE, ProgressMeter, SendSession,
+                          TransferError, TransferReceiver, new_transfer_id, path_chunk_size, tune_socket)
+
+DEFAULT_PORT = 12345
+# 만료된 전송을 정리하는 간격 (초)
+EXPIRE_INTERVAL = 1.0
+# 한 번의 이벤트 루프 차례에 보내는 최대 burst 수. 다른 전송과 수신 처리가 밀리지 않도록 나눔
+MAX_BURSTS_PER_TURN = 8
+
+
+class ReceiverProtocol(asyncio.DatagramProtocol):
+    """
+    TransferReceiver 를 asyncio 이벤트 루프에서 실행하는 수신 프로토콜입니다.
+    하나의 루프에서 여러 송신 쪽의 전송을 동시에 받습니다.
+    """
+
+    def __init__(self, receiver, buffer_size=DEFAULT_SOCKET_BUFFER):
+        self.receiver = receiver
+        self.buffer_size = buffer_size
+        self.transport = None
+        self.expire_handle = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        # 운영체제 상한 때문에 요청보다 작을 수 있는 실제 수신 버퍼 크기로 창 크기를 제한
+        self.receiver.receive_buffer = tune_socket(transport.get_extra_info("socket"), self.buffer_size)[1]
+        self.expire_handle = asyncio.get_running_loop().call_later(EXPIRE_INTERVAL, self._expire)
+
+    def datagram_received(self, data, addr):
+        now = asyncio.get_running_loop().time()
+        for reply in self.receiver.handle_datagram(data, addr, now):
+            self.transport.sendto(reply, addr)
+
+    def error_received(self, exc):
+        # (Windows) 이전 응답이 ICMP port unreachable 로 돌아온 경우 등. 다른 전송은 계속 받음
+        pass
+
+    def _expire(self):
+        loop = asyncio.get_running_loop()
+        self.receiver.expire(loop.time())
+        self.expire_handle = loop.call_later(EXPIRE_INTERVAL, self._expire)
+
+    def connection_lost(self, exc):
+        if self.expire_handle is not None:
+            self.expire_handle.cancel()
+        self.receiver.close()
+
+    @property
+    def address(self):
+        # 실제로 바인딩된 (IP, 포트). port=0 으로 열었을 때 쓰는 포트를 알 수 있음
+        return self.transport.get_extra_info("sockname")
+
+
+async def start_receiver(host="0.0.0.0", port=DEFAULT_PORT, output_dir=".", buffer_size=DEFAULT_SOCKET_BUFFER,
+                         **receiver_options):
+    """
+    현재 이벤트 루프에서 파일 수신을 시작합니다.
+
+    Args:
+        host (str): 바인딩할 주소. 같은 컴퓨터에서만 받으려면 "127.0.0.1"
+        port (int): 바인딩할 포트. 0 이면 빈 포트를 골라 씀 (테스트용 수신 쪽)
+        output_dir (str): 받은 파일을 저장할 디렉터리
+        buffer_size (int): 소켓 송수신 버퍼 크기
+        **receiver_options: TransferReceiver 인자 (prefix, max_chunk_size, idle_timeout, on_event 등)
+
+    Returns:
+        tuple: (transport, ReceiverProtocol). transport.close()로 수신을 멈춥니다.
+    """
+    receiver = TransferReceiver(output_dir, **receiver_options)
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(lambda: ReceiverProtocol(receiver, buffer_size),
+                                               local_addr=(host, port))
+
+
+class SenderProtocol(asyncio.DatagramProtocol):
+    """
+    SendSession 하나를 asyncio 이벤트 루프에서 실행하는 송신 프로토콜입니다.
+    소켓이 열린 뒤 start(session)으로 전송을 시작하며, 전송이 끝나면 done future 에
+    결과(보낸 바이트 수)나 TransferError 가 들어갑니다.
+    on_progress(done, total, rate, eta) 는 수신 쪽이 확인한 바이트 수로 최대 10 Hz 로 호출됩니다.
+    """
+
+    def __init__(self, done, on_progress=None):
+        self.session = None
+        self.done = done
+        self.on_progress = on_progress
+        self.progress = None
+        self.transport = None
+        self.paused = False
+        self.timer = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def start(self, session):
+        self.session = session
+        self.progress = ProgressMeter(session.size, now=asyncio.get_running_loop().time())
+        self._pump()
+
+    def datagram_received(self, data, addr):
+        if self.session is None:
+            return
+        now = asyncio.get_running_loop().time()
+        self.session.handle_packet(data, now)
+        self._report_progress(now)
+        self._pump()
+
+    def _report_progress(self, now, force=False):
+        if self.on_progress is None:
+            return
+        update = self.progress.update(self.session.acked_bytes, now, force)
+        if update is not None:
+            self.on_progress(*update)
+
+    def error_received(self, exc):
+        # 수신 쪽 포트가 아직 열리지 않음 (ICMP port unreachable). 재전송으로 처리
+        pass
+
+    def pause_writing(self):
+        # 소켓 송신 버퍼가 가득 참. resume_writing 까지 보내지 않음
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        self._pump()
+
+    def _pump(self):
+        session = self.session
+        loop = asyncio.get_running_loop()
+        for _ in range(MAX_BURSTS_PER_TURN):
+            if self.paused or session.finished:
+                break
+            packets = session.packets(loop.time())
+            for packet in packets:
+                self.transport.sendto(packet)
+            if not packets or not session.ready():
+                break
+
+        if session.finished:
+            self._finish()
+            return
+        if self.timer is not None:
+            self.timer.cancel()
+        # 바로 보낼 것이 남았으면 다음 차례에, 아니면 응답이 없을 때 상태 요청을 보낼 시각에 다시 확인
+        if session.ready() and not self.paused:
+            self.timer = loop.call_soon(self._pump)
+        else:
+            self.timer = loop.call_later(session.timeout / 4, self._pump)
+
+    def _finish(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.done.done():
+            if self.session.failed:
+                self.done.set_exception(TransferError(self.session.error))
+            else:
+                self._report_progress(asyncio.get_running_loop().time(), force=True)
+                self.done.set_result(self.session.size)
+        self.transport.close()
+
+    def connection_lost(self, exc):
+        if self.timer is not None:
+            self.timer.cancel()
+        if not self.done.done():
+            self.done.set_exception(TransferError(str(exc) if exc else "connection closed"))
+
+
+async def send_file_async(path, address, chunk_size=None, window=None, timeout=DEFAULT_TIMEOUT, name=None,
+                          buffer_size=DEFAULT_SOCKET_BUFFER, on_progress=None):
+    """
+    파일을 UDP 로 보내고 수신 쪽이 저장을 마칠 때까지 기다립니다.
+    여러 파일을 asyncio.gather 로 동시에 보낼 수 있습니다.
+
+    Args:
+        path (str): 보낼 파일 경로
+        address (tuple): 수신 쪽 (IP, 포트)
+        chunk_size (int): DATA 패킷 하나에 담는 바이트 수 (최대 MAX_CHUNK_SIZE).
+                          None 이면 경로 MTU 에 맞춤. 수신 쪽이 더 작은 값을 허용하면 그 값을 사용
+        window (int): 확인받지 않은 상태로 보낼 수 있는 최대 조각 수. None 이면 약 DEFAULT_WINDOW_BYTES
+        timeout (float): 응답 대기 시간 (초). 응답이 없으면 상태 요청을 다시 보냅니다.
+        name (str): 수신 쪽에 알릴 파일 이름. None 이면 path 의 파일 이름
+        buffer_size (int): 소켓 송수신 버퍼 크기
+        on_progress (callable): on_progress(done, total, rate, eta). 수신 쪽이 확인한 바이트 수,
+                                파일 크기, 초당 바이트, 남은 시간(초)으로 최대 10 Hz 로 호출
+
+    Returns:
+        int: 보낸 파일 크기 (바이트)
+
+    Raises:
+        TransferError: 수신 쪽이 응답하지 않거나 전송을 취소한 경우
+    """
+    loop = asyncio.get_running_loop()
+    size = os.path.getsize(path)
+    done = loop.create_future()
+    with open(path, "rb") as f:
+        transport, protocol = await loop.create_datagram_endpoint(lambda: SenderProtocol(done, on_progress),
+                                                                  remote_addr=address)
+        try:
+            sock = transport.get_extra_info("socket")
+            tune_socket(sock, buffer_size)
+            # 경로 MTU 는 연결된 소켓에서만 알 수 있으므로 소켓을 연 뒤 조각 크기를 정함
+            chunk_size = min(chunk_size or path_chunk_size(sock), MAX_CHUNK_SIZE)
+            protocol.start(SendSession(new_transfer_id(), name or os.path.basename(path), size, f,
+                                       chunk_size, window, timeout))
+            return await done
+        finally:
+            transport.close()
+
+
+def send_file(path, address, **options):
+    # 이벤트 루프가 없는 코드(GUI, 스크립트)에서 쓰는 동기 버전
+    return asyncio.run(send_file_async(path, address, **options))
+
+
+async def serve(host="0.0.0.0", port=DEFAULT_PORT, output_dir="."):
+    # 중지될 때까지 파일을 받고, 전송 시작/완료만 출력하는 헤드리스 수신 데몬
+    def on_event(event, session):
+        print(f"{event}: {session.name} ({session.size} bytes) from {session.addr[0]}:{session.addr[1]}")
+
+    transport, protocol = await start_receiver(host, port, output_dir, on_event=on_event)
+    print(f"receiving on {protocol.address[0]}:{protocol.address[1]} -> {os.path.abspath(output_dir)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        transport.close()
+        # connection_lost 에서 진행 중인 전송을 정리할 차례를 줌
+        await asyncio.sleep(0)
+
+
+async def send_files(address, paths, **options):
+    # 여러 파일을 하나의 이벤트 루프에서 동시에 보내고 파일별 결과(크기 또는 예외)를 돌려줌
+    return await asyncio.gather(*(send_file_async(path, address, **options) for path in paths),
+                                return_exceptions=True)
+
+
+# 사용 예제
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UDP 파일 전송")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="파일 수신 데몬 실행")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--output", default=".", help="받은 파일을 저장할 디렉터리")
+
+    send_parser = commands.add_parser("send", help="파일 보내기")
+    send_parser.add_argument("host")
+    send_parser.add_argument("files", nargs="+")
+    send_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    send_parser.add_argument("--chunk-size", type=int, default=None, help="조각 크기 (기본: 경로 MTU)")
+    send_parser.add_argument("--window", type=int, default=None, help="창 크기 (조각 수)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.output))
+        except KeyboardInterrupt:
+            pass
+    else:
+        results = asyncio.run(send_files((args.host, args.port), args.files, chunk_size=args.chunk_size,
+                                         window=args.window))
+        failed = False
+        for path, result in zip(args.files, results):
+            if isinstance(result, Exception):
+                failed = True
+                print(f"failed: {path}: {result}")
+            else:
+                print(f"sent: {path} ({result} bytes)")
+        raise SystemExit(1 if failed else 0)